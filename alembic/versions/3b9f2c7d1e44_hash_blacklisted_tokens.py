@@ -0,0 +1,41 @@
+"""store blacklisted token digests
+
+Revision ID: 3b9f2c7d1e44
+Revises: 8782a5248422
+Create Date: 2026-10-18 09:12:03.481220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9f2c7d1e44'
+down_revision: Union[str, None] = '8782a5248422'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DELETE FROM token_blacklist WHERE expires_at <= now()")
+    op.add_column('token_blacklist', sa.Column('token_hash', sa.String(length=64), nullable=True))
+    op.execute("UPDATE token_blacklist SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+    op.alter_column('token_blacklist', 'token_hash', nullable=False)
+    op.drop_index(op.f('ix_token_blacklist_token'), table_name='token_blacklist')
+    op.drop_column('token_blacklist', 'token')
+    op.create_index(op.f('ix_token_blacklist_token_hash'), 'token_blacklist', ['token_hash'], unique=True)
+    op.create_index(op.f('ix_token_blacklist_expires_at'), 'token_blacklist', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Raw tokens cannot be recovered from their digests; revoked entries are dropped.
+    op.drop_index(op.f('ix_token_blacklist_expires_at'), table_name='token_blacklist')
+    op.drop_index(op.f('ix_token_blacklist_token_hash'), table_name='token_blacklist')
+    op.execute("DELETE FROM token_blacklist")
+    op.drop_column('token_blacklist', 'token_hash')
+    op.add_column('token_blacklist', sa.Column('token', sa.String(), nullable=False))
+    op.create_index(op.f('ix_token_blacklist_token'), 'token_blacklist', ['token'], unique=True)
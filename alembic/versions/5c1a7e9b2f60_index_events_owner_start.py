@@ -0,0 +1,28 @@
+"""index events by owner and start time
+
+Revision ID: 5c1a7e9b2f60
+Revises: 3b9f2c7d1e44
+Create Date: 2026-10-18 10:02:41.226904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1a7e9b2f60'
+down_revision: Union[str, None] = '3b9f2c7d1e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_events_owner_start_id', 'events', ['owner_id', 'start_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_owner_start_id', table_name='events')
@@ -0,0 +1,34 @@
+"""gist index on event time range
+
+Revision ID: 7d4e8a1c3b92
+Revises: 5c1a7e9b2f60
+Create Date: 2026-10-18 11:27:55.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4e8a1c3b92'
+down_revision: Union[str, None] = '5c1a7e9b2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tsrange() raises on a lower bound above the upper one, which would abort the index
+    # build. Nothing validated the order before this revision, so rows entered with the ends
+    # the wrong way round are swapped (SET reads the pre-update values) instead of failing.
+    op.execute("UPDATE events SET start_time = end_time, end_time = start_time WHERE end_time < start_time")
+    op.execute(
+        "CREATE INDEX ix_events_time_range ON events USING gist (tsrange(start_time, end_time))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_time_range', table_name='events')
@@ -0,0 +1,39 @@
+"""create event occurrences
+
+Revision ID: 9a2b6f3d8c15
+Revises: 7d4e8a1c3b92
+Create Date: 2026-10-18 12:48:10.553018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a2b6f3d8c15'
+down_revision: Union[str, None] = '7d4e8a1c3b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_occurrences',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_event_occurrences_event_start', 'event_occurrences', ['event_id', 'start_time'], unique=False)
+    op.create_index('ix_event_occurrences_start_time', 'event_occurrences', ['start_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_occurrences_start_time', table_name='event_occurrences')
+    op.drop_index('ix_event_occurrences_event_start', table_name='event_occurrences')
+    op.drop_table('event_occurrences')
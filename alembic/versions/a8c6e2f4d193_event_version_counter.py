@@ -0,0 +1,53 @@
+"""per-event version counter and unique version numbers
+
+Revision ID: a8c6e2f4d193
+Revises: f5d9a1c3e874
+Create Date: 2026-10-18 17:26:52.640281
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c6e2f4d193'
+down_revision: Union[str, None] = 'f5d9a1c3e874'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent updates could previously allocate the same number twice; renumber those
+    # events in (version_number, id) order before the constraint goes on
+    op.execute("""
+        UPDATE event_versions AS ev
+        SET version_number = ranked.rn
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY event_id ORDER BY version_number, id) AS rn
+            FROM event_versions
+            WHERE event_id IN (
+                SELECT event_id FROM event_versions GROUP BY event_id, version_number HAVING count(*) > 1
+            )
+        ) AS ranked
+        WHERE ev.id = ranked.id AND ev.version_number <> ranked.rn
+    """)
+    op.drop_index('ix_event_versions_event_version', table_name='event_versions')
+    op.create_unique_constraint('uix_event_versions_event_version', 'event_versions', ['event_id', 'version_number'])
+
+    op.add_column('events', sa.Column('current_version', sa.Integer(), server_default='1', nullable=False))
+    op.execute("""
+        UPDATE events
+        SET current_version = COALESCE(
+            (SELECT max(version_number) FROM event_versions WHERE event_versions.event_id = events.id), 1
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('events', 'current_version')
+    op.drop_constraint('uix_event_versions_event_version', 'event_versions', type_='unique')
+    op.create_index('ix_event_versions_event_version', 'event_versions', ['event_id', 'version_number'], unique=False)
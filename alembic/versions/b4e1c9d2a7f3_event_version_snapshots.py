@@ -0,0 +1,133 @@
+"""event version snapshots
+
+Revision ID: b4e1c9d2a7f3
+Revises: 9a2b6f3d8c15
+Create Date: 2026-10-18 14:02:37.418265
+
+"""
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e1c9d2a7f3'
+down_revision: Union[str, None] = '9a2b6f3d8c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.repositories.event_version_repository.VERSIONED_FIELDS
+VERSIONED_FIELDS = (
+    "title", "description", "start_time", "end_time", "location", "is_recurring", "recurrence_pattern"
+)
+BATCH_SIZE = 1000
+
+events = sa.table(
+    'events',
+    sa.column('id', sa.Integer()),
+    sa.column('owner_id', sa.Integer()),
+    sa.column('created_at', sa.DateTime()),
+    sa.column('title', sa.String()),
+    sa.column('description', sa.String()),
+    sa.column('start_time', sa.DateTime()),
+    sa.column('end_time', sa.DateTime()),
+    sa.column('location', sa.String()),
+    sa.column('is_recurring', sa.Boolean()),
+    sa.column('recurrence_pattern', sa.String()),
+)
+event_versions = sa.table(
+    'event_versions',
+    sa.column('id', sa.Integer()),
+    sa.column('event_id', sa.Integer()),
+    sa.column('version_number', sa.Integer()),
+    sa.column('version_data', sa.JSON()),
+    sa.column('is_snapshot', sa.Boolean()),
+    sa.column('created_at', sa.DateTime()),
+    sa.column('created_by', sa.Integer()),
+)
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def _is_create_snapshot(row) -> bool:
+    return row.version_number == 1 and set(VERSIONED_FIELDS) <= set(row.version_data or {})
+
+
+def _backfill_snapshots(bind) -> None:
+    """Rewrite every existing version as a full snapshot.
+
+    Legacy update rows hold only the fields sent by the client, including explicit nulls the
+    update ignored, so they cannot be replayed as deltas. Events created in bulk have no
+    create row at all: either no versions, or a v1 that is really their first update. Each
+    event's history is replayed here the way it was written (nulls skipped) from its create
+    row, or, without one, from the current event row with every field updated later set to
+    its earliest recorded value (older values were never stored). Events without versions
+    get a v1 snapshot of their current row.
+    """
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(events).where(events.c.id > last_id).order_by(events.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        history = bind.execute(
+            sa.select(event_versions.c.id, event_versions.c.event_id, event_versions.c.version_number,
+                      event_versions.c.version_data)
+            .where(event_versions.c.event_id.in_([row.id for row in rows]))
+            .order_by(event_versions.c.event_id, event_versions.c.version_number, event_versions.c.id)
+        ).all()
+        by_event = {event_id: list(versions) for event_id, versions in groupby(history, key=lambda v: v.event_id)}
+
+        inserts, updates = [], []
+        for row in rows:
+            versions = by_event.get(row.id)
+            current = {field: _json_value(getattr(row, field)) for field in VERSIONED_FIELDS}
+            if not versions:
+                inserts.append({
+                    'event_id': row.id, 'version_number': 1, 'version_data': current, 'is_snapshot': True,
+                    'created_at': row.created_at, 'created_by': row.owner_id,
+                })
+                continue
+            if _is_create_snapshot(versions[0]):
+                state = dict(versions[0].version_data)
+                versions = versions[1:]
+            else:
+                state = current
+                for field in VERSIONED_FIELDS:
+                    first = next(
+                        (v.version_data[field] for v in versions if (v.version_data or {}).get(field) is not None), None
+                    )
+                    if first is not None:
+                        state[field] = first
+            for version in versions:
+                state.update({k: v for k, v in (version.version_data or {}).items() if k in VERSIONED_FIELDS and v is not None})
+                updates.append({'row_id': version.id, 'data': dict(state)})
+
+        if inserts:
+            bind.execute(event_versions.insert(), inserts)
+        if updates:
+            bind.execute(
+                event_versions.update()
+                .where(event_versions.c.id == sa.bindparam('row_id'))
+                .values(version_data=sa.bindparam('data', type_=sa.JSON()), is_snapshot=True),
+                updates,
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('event_versions', sa.Column('is_snapshot', sa.Boolean(), server_default=sa.true(), nullable=False))
+    _backfill_snapshots(op.get_bind())
+    op.create_index('ix_event_versions_event_snapshot', 'event_versions', ['event_id', 'is_snapshot', 'version_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_versions_event_snapshot', table_name='event_versions')
+    op.drop_column('event_versions', 'is_snapshot')
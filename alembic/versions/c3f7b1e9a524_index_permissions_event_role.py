@@ -0,0 +1,28 @@
+"""index permissions by event, role and id
+
+Revision ID: c3f7b1e9a524
+Revises: a8c6e2f4d193
+Create Date: 2026-10-18 18:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7b1e9a524'
+down_revision: Union[str, None] = 'a8c6e2f4d193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_permissions_event_role_id', 'permissions', ['event_id', 'role', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_permissions_event_role_id', table_name='permissions')
@@ -0,0 +1,45 @@
+"""create event version archives
+
+Revision ID: d7a3f5e8b216
+Revises: b4e1c9d2a7f3
+Create Date: 2026-10-18 15:21:09.774102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f5e8b216'
+down_revision: Union[str, None] = 'b4e1c9d2a7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_version_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('first_version', sa.Integer(), nullable=False),
+    sa.Column('last_version', sa.Integer(), nullable=False),
+    sa.Column('min_version_id', sa.Integer(), nullable=False),
+    sa.Column('max_version_id', sa.Integer(), nullable=False),
+    sa.Column('version_count', sa.Integer(), nullable=False),
+    sa.Column('codec', sa.String(length=16), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('raw_bytes', sa.Integer(), nullable=False),
+    sa.Column('compressed_bytes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_event_version_archives_event_versions', 'event_version_archives', ['event_id', 'first_version', 'last_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_version_archives_event_versions', table_name='event_version_archives')
+    op.drop_table('event_version_archives')
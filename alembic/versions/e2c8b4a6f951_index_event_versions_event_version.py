@@ -0,0 +1,28 @@
+"""index event versions by event and version number
+
+Revision ID: e2c8b4a6f951
+Revises: d7a3f5e8b216
+Create Date: 2026-10-18 16:05:44.206517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c8b4a6f951'
+down_revision: Union[str, None] = 'd7a3f5e8b216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_event_versions_event_version', 'event_versions', ['event_id', 'version_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_versions_event_version', table_name='event_versions')
@@ -0,0 +1,31 @@
+"""store version number on changelogs
+
+Revision ID: f5d9a1c3e874
+Revises: e2c8b4a6f951
+Create Date: 2026-10-18 16:48:30.915372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5d9a1c3e874'
+down_revision: Union[str, None] = 'e2c8b4a6f951'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('changelogs', sa.Column('version_number', sa.Integer(), nullable=True))
+    op.execute("UPDATE changelogs SET version_number = 1 WHERE description = 'Event created'")
+    op.create_index('ix_changelogs_event_version', 'changelogs', ['event_id', 'version_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_changelogs_event_version', table_name='changelogs')
+    op.drop_column('changelogs', 'version_number')
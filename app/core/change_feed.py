@@ -0,0 +1,224 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.etag import event_etag
+from app.models.permission import RoleEnum
+from app.repositories.event_version_repository import compose_changes
+
+logger = logging.getLogger(__name__)
+
+ChangeMessage = Dict[str, Any]
+ChangeHandler = Callable[[str, ChangeMessage], None]
+
+_PENDING_KEY = "change_feed_pending"
+
+def event_topic(event_id: int) -> str:
+    return f"event:{event_id}"
+
+def user_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def version_message(
+    event_id: int, version_number: int, changes: Dict[str, Dict[str, Any]], description: str, created_by: int
+) -> ChangeMessage:
+    return {
+        "type": "version",
+        "event_id": event_id,
+        "from_version": version_number,
+        "version_number": version_number,
+        "etag": event_etag(event_id, version_number),
+        "changes": changes,
+        "description": description,
+        "created_by": created_by,
+    }
+
+def permission_message(event_id: int, user_id: int, role: Optional[RoleEnum]) -> ChangeMessage:
+    """``role=None`` means the user lost access to the event."""
+    return {
+        "type": "permission",
+        "event_id": event_id,
+        "user_id": user_id,
+        "role": RoleEnum(role).value if role is not None else None,
+    }
+
+def deleted_message(event_id: int) -> ChangeMessage:
+    return {"type": "deleted", "event_id": event_id}
+
+def _coalesce_key(message: ChangeMessage) -> tuple:
+    if message["type"] == "permission":
+        return ("permission", message["event_id"], message["user_id"])
+    return (message["type"], message["event_id"])
+
+class ChangeBroker:
+    """Carries committed changes to the ChangeFeed of every worker.
+
+    Unlike permission invalidations, a worker does not deliver its own changes locally
+    first: a broker must hand each message back to its publisher too, so every subscriber
+    sees it exactly once. Replace the in-process broker with a Redis or Postgres
+    NOTIFY-backed one through ``set_change_broker`` when running several workers.
+    """
+
+    def publish(self, topic: str, message: ChangeMessage) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, handler: ChangeHandler) -> None:
+        raise NotImplementedError
+
+class LocalChangeBroker(ChangeBroker):
+    """In-process stand-in: delivers to subscribers in this process only."""
+
+    def __init__(self):
+        self._handlers: List[ChangeHandler] = []
+
+    def publish(self, topic: str, message: ChangeMessage) -> None:
+        for handler in list(self._handlers):
+            handler(topic, message)
+
+    def subscribe(self, handler: ChangeHandler) -> None:
+        self._handlers.append(handler)
+
+class Subscription:
+    """Bounded queue of one subscriber, consumed by a single asyncio task.
+
+    Messages with the same key coalesce. Consecutive versions of an event merge into one
+    message spanning all of them, and a newer permission change replaces an older one.
+    If the queue is still full, the oldest message is dropped and the next batch starts
+    with a ``resync`` notice so the client can refetch.
+    """
+
+    def __init__(self, feed: "ChangeFeed", topics: Sequence[str], max_queue: int, loop: asyncio.AbstractEventLoop):
+        self.feed = feed
+        self.topics = tuple(topics)
+        self.max_queue = max_queue
+        self._loop = loop
+        self._pending: "OrderedDict[tuple, ChangeMessage]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._dropped = 0
+
+    def offer(self, message: ChangeMessage) -> None:
+        """Queue ``message`` from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._push, message)
+        except RuntimeError:
+            # The consumer's loop is gone; unsubscribe will follow
+            pass
+
+    def _push(self, message: ChangeMessage) -> None:
+        key = _coalesce_key(message)
+        previous = self._pending.pop(key, None)
+        if previous is not None:
+            if message["type"] == "version":
+                message = {
+                    **message,
+                    "from_version": previous["from_version"],
+                    "changes": compose_changes([previous["changes"], message["changes"]]),
+                }
+            self.feed._count("coalesced")
+        elif len(self._pending) >= self.max_queue:
+            self._pending.popitem(last=False)
+            self._dropped += 1
+            self.feed._count("dropped")
+        self._pending[key] = message
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> List[ChangeMessage]:
+        """Everything queued so far, waiting up to ``timeout`` seconds; empty on timeout."""
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        batch = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        if self._dropped:
+            batch.insert(0, {"type": "resync", "dropped": self._dropped})
+            self._dropped = 0
+        return batch
+
+class ChangeFeed:
+    """Per-process registry of live subscriptions, keyed by topic."""
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._lock = Lock()
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def subscribe(self, topics: Sequence[str]) -> Subscription:
+        """Register a subscription; call from the event loop that will consume it."""
+        subscription = Subscription(self, topics, self.max_queue, asyncio.get_running_loop())
+        with self._lock:
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def deliver(self, topic: str, message: ChangeMessage) -> None:
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+            self.published += 1
+            self.delivered += len(subscribers)
+        for subscription in subscribers:
+            subscription.offer(message)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "topics": len(self._topics),
+                "subscriptions": len({s for subscribers in self._topics.values() for s in subscribers}),
+                "published": self.published,
+                "delivered": self.delivered,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+            }
+
+change_feed = ChangeFeed(settings.CHANGE_FEED_QUEUE_SIZE)
+
+_broker: ChangeBroker = LocalChangeBroker()
+_broker.subscribe(change_feed.deliver)
+
+def set_change_broker(broker: ChangeBroker) -> None:
+    global _broker
+    broker.subscribe(change_feed.deliver)
+    _broker = broker
+
+def queue_change(db: Session, topics: Sequence[str], message: ChangeMessage) -> None:
+    """Publish ``message`` on ``topics`` once ``db`` commits; it is discarded on rollback."""
+    db.info.setdefault(_PENDING_KEY, []).append((tuple(topics), message))
+
+@sa_event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for topics, message in session.info.pop(_PENDING_KEY, ()):
+        for topic in topics:
+            try:
+                _broker.publish(topic, message)
+            except Exception:
+                logger.exception("Failed to publish change on %s", topic)
+
+@sa_event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction) -> None:
+    # Runs after after_commit, so only changes of rolled-back transactions are left here
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
@@ -2,8 +2,96 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+
+    # Engine / connection pool profile
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: bool = True
+    DB_CONNECT_TIMEOUT_SECONDS: int = 10
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the server-side statement timeout
+
+    # Default scheduling-conflict handling on event writes: ignore, warn or reject
+    EVENT_CONFLICT_MODE: str = "ignore"
+
+    # Rows per multi-row INSERT chunk in POST /api/events/batch
+    EVENT_BATCH_CHUNK_SIZE: int = 1000
+
+    # Streaming NDJSON/CSV import (POST /api/events/import)
+    EVENT_IMPORT_CHUNK_SIZE: int = 5000
+    EVENT_IMPORT_MAX_ERRORS_PER_CHUNK: int = 100
+
+    # Streaming ICS/NDJSON export (GET /api/events/export)
+    EVENT_EXPORT_BATCH_SIZE: int = 1000
+    EVENT_EXPORT_FLUSH_BYTES: int = 65536
+
+    # Event version storage: a full snapshot every N versions, deltas in between
+    EVENT_VERSION_SNAPSHOT_INTERVAL: int = 20
+
+    # Cold storage for old event versions: versions older than the age limit, or beyond the
+    # newest KEEP_LATEST per event, are moved into zlib-compressed batches by a background job
+    EVENT_VERSION_ARCHIVE_ENABLED: bool = False
+    EVENT_VERSION_ARCHIVE_AFTER_DAYS: int = 90
+    EVENT_VERSION_ARCHIVE_KEEP_LATEST: int = 100
+    EVENT_VERSION_ARCHIVE_VERSIONS_PER_BLOB: int = 500
+    EVENT_VERSION_ARCHIVE_EVENTS_PER_RUN: int = 500
+    EVENT_VERSION_ARCHIVE_INTERVAL_SECONDS: int = 3600
+
+    # LRU of composed version diffs (GET /api/events/{id}/diff/...)
+    VERSION_DIFF_CACHE_SIZE: int = 2048
+
+    # Per-process (event_id, user_id) -> role cache; "no access" is cached for a shorter time
+    PERMISSION_CACHE_MAX_SIZE: int = 50000
+    PERMISSION_CACHE_TTL_SECONDS: int = 60
+    PERMISSION_CACHE_NEGATIVE_TTL_SECONDS: int = 10
+
+    # Largest request accepted by the bulk share endpoints
+    PERMISSION_BULK_MAX_ENTRIES: int = 1000
+
+    # Server-sent change feed: per-subscriber queue bound and keepalive interval
+    CHANGE_FEED_QUEUE_SIZE: int = 256
+    CHANGE_FEED_KEEPALIVE_SECONDS: int = 15
+
+    # Recurrence expansion (app.core.recurrence)
+    RECURRENCE_MAX_OCCURRENCES: int = 10000
+    RECURRENCE_MAX_WINDOW_DAYS: int = 366
+    RECURRENCE_CACHE_MAX_EVENTS: int = 5000
+    RECURRENCE_CACHE_WINDOWS_PER_EVENT: int = 4
+
+    # Optional materialized event_occurrences store with a rolling horizon
+    OCCURRENCE_STORE_ENABLED: bool = False
+    OCCURRENCE_HORIZON_DAYS: int = 365
+    OCCURRENCE_REFRESH_SECONDS: int = 3600
+
+    # Run blocking ORM work off the event loop (see app.db.base.run_db)
+    DB_RUN_IN_THREADPOOL: bool = True
+    # Worker threads for run_db; 0 matches DB_POOL_SIZE + DB_MAX_OVERFLOW so callers queue
+    # on the limiter instead of holding a thread while they wait for a pooled connection
+    DB_THREADPOOL_SIZE: int = 0
+
+    # bcrypt work factor and the bounded pool that runs it
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Per-process cache of verified access tokens (app.core.token_cache)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # In-memory token blacklist refresh and expired-row sweeping. A logout on one worker
+    # reaches the others on their next sync, so a revoked token can still be accepted
+    # elsewhere for up to TOKEN_BLACKLIST_SYNC_SECONDS
+    TOKEN_BLACKLIST_SYNC_SECONDS: int = 15
+    TOKEN_BLACKLIST_SWEEP_SECONDS: int = 600
+    TOKEN_BLACKLIST_SWEEP_BATCH_SIZE: int = 1000
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+from typing import Annotated, Optional
+from pydantic import AfterValidator
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """``value`` as a naive UTC datetime, the form every timestamp column stores.
+
+    Clients may send offsets (``...Z`` or ``+02:00``); comparing those with stored values
+    raises in Python, and Postgres receives them as timestamptz. Naive input is taken as UTC.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+# Request parameter type: parsed like ``datetime``, then normalized by to_naive_utc
+UTCDateTime = Annotated[datetime, AfterValidator(to_naive_utc)]
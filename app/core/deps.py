@@ -2,16 +2,32 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.db.base import get_db  
-from app.core.security import verify_token
+from app.core.security import decode_token
+from app.core.token_cache import token_cache, CachedUser
+from app.core.token_blacklist import token_blacklist
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    user_id = verify_token(token, scope="access_token")
-    if user_id is None:
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> CachedUser:
+    if token_blacklist.is_revoked(token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user
+
+    claims = decode_token(token, scope="access_token")
+    if claims is None:
         raise HTTPException(status_code= status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-    user = db.query(User).filter(User.id == user_id).first()
+    try:
+        user = db.query(User).filter(User.id == claims["sub"]).first()
+    finally:
+        # Do not hold a pooled connection until the route's run_db call gets a worker
+        db.close()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
\ No newline at end of file
+
+    current_user = CachedUser(id=user.id, username=user.username, email=user.email)
+    token_cache.put(token, claims, current_user)
+    return current_user
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+
+DiffKey = Tuple[int, int, int]  # (event_id, from_version, to_version)
+
+class DiffCache:
+    """Bounded LRU of composed version diffs.
+
+    History is append-only, so a diff between two existing versions never changes;
+    entries only need dropping when the event itself is deleted.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[DiffKey, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: DiffKey) -> Optional[Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            diff = self._entries.get(key)
+            if diff is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return diff
+
+    def put(self, key: DiffKey, diff: Dict[str, Dict[str, Any]]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = diff
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_event(self, event_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == event_id]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+diff_cache = DiffCache(settings.VERSION_DIFF_CACHE_SIZE)
@@ -0,0 +1,22 @@
+from typing import Optional
+
+def event_etag(event_id: int, version: int) -> str:
+    """Strong ETag for an event, derived from its version counter."""
+    return f'"{event_id}.{version}"'
+
+def _candidates(header: str):
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+def if_match_satisfied(header: Optional[str], etag: str) -> bool:
+    """If-Match uses strong comparison, so weak tags never match."""
+    if header is None:
+        return True
+    tags = _candidates(header)
+    return "*" in tags or etag in tags
+
+def if_none_match_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison."""
+    if header is None:
+        return False
+    tags = [tag[2:] if tag.startswith("W/") else tag for tag in _candidates(header)]
+    return "*" in tags or etag in tags
@@ -0,0 +1,28 @@
+import asyncio
+import logging
+from anyio import to_thread
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.repositories.occurrence_repository import OccurrenceRepository
+
+logger = logging.getLogger(__name__)
+
+def extend_occurrences() -> int:
+    db = SessionLocal()
+    try:
+        return OccurrenceRepository(db).extend_all()
+    finally:
+        db.close()
+
+async def run_occurrence_worker() -> None:
+    """Keep the materialized occurrence store filled up to the rolling horizon."""
+    while True:
+        try:
+            inserted = await to_thread.run_sync(extend_occurrences)
+            if inserted:
+                logger.info("Materialized %d event occurrences", inserted)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Occurrence refresh failed")
+        await asyncio.sleep(settings.OCCURRENCE_REFRESH_SECONDS)
@@ -1,33 +1,66 @@
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
-from app.db.repositories.event_share_repository import EventShareRepository
 from app.core.deps import get_current_user
+from app.core.token_cache import CachedUser
+from app.db.base import get_db, run_db
+from app.models.event import Event
+from app.models.permission import RoleEnum
+from app.repositories.collaboration_repository import CollaborationRepository
+from app.repositories.event_repository import EventRepository
 
-def event_permission_middleware(db: Session):
-    async def middleware(request: Request, call_next):
-        path = request.url.path
+ROLE_RANK = {RoleEnum.viewer: 1, RoleEnum.editor: 2, RoleEnum.owner: 3}
 
-        if path.startswith("/api/events"):
-            parts = path.split("/")
-            try:
-                event_idx = parts.index("events") + 1
-                event_id = int(parts[event_idx])
-            except(ValueError, IndexError):
-                return await call_next(request)
-            
-            user = await get_current_user(request)
-            if not user:
-                return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": "Unauthorized User"})
-            
-            repo = PermissionRepository(db)
-            share = repo.get_by_event_and_user(event_id, user.id)
+@dataclass
+class EventAccess:
+    """Caller, event and role resolved for a request; also kept on ``request.state.event_access``.
 
-            if not share: 
-                return HTTPException(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "Access denied"})
-        
-        return await call_next(request)
-    
-    return middleware
-            
+    ``event`` is only loaded for dependencies declared ``with_event=True``.
+    """
+    user: CachedUser
+    event_id: int
+    role: RoleEnum
+    event: Optional[Event] = None
+
+def has_role(role: RoleEnum, minimum: RoleEnum) -> bool:
+    return ROLE_RANK[role] >= ROLE_RANK[minimum]
+
+def _load_access(db: Session, event_id: int, user_id: int, with_event: bool) -> Tuple[Optional[RoleEnum], Optional[Event]]:
+    try:
+        role = CollaborationRepository(db).get_role(event_id, user_id)
+        event = None
+        # Without access the event is looked up too, so unknown events give 404 rather than 403
+        if with_event or role is None:
+            event = EventRepository(db).get(event_id, include=())
+            if event is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+        return role, event
+    finally:
+        # Hand the connection back before the route queues for its own run_db slot; a session
+        # holding one while it waits could starve the workers that already have a slot
+        db.close()
+
+def require_event_role(minimum: RoleEnum, path_param: str = "event_id", with_event: bool = False):
+    """Dependency that authorizes the caller on the event named by ``path_param``.
+
+    The role comes from the permission cache, so a repeated check usually costs no query.
+    Unknown events give 404 and a missing or lower role gives 403. With ``with_event`` the
+    event is loaded too, without its history relations, for routes that read it.
+    """
+    async def dependency(
+        request: Request,
+        user: CachedUser = Depends(get_current_user),
+        db: Session = Depends(get_db),
+    ) -> EventAccess:
+        try:
+            event_id = int(request.path_params[path_param])
+        except (KeyError, ValueError):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+        role, event = await run_db(_load_access, db, event_id, user.id, with_event)
+        if role is None or not has_role(role, minimum):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied")
+        access = EventAccess(user=user, event_id=event_id, role=role, event=event)
+        request.state.event_access = access
+        return access
+    return dependency
@@ -0,0 +1,141 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.models.permission import RoleEnum
+
+PermissionKey = Tuple[int, int]  # (event_id, user_id)
+InvalidationHandler = Callable[[int, Optional[int]], None]
+
+MISSING = object()
+
+class InvalidationChannel(ABC):
+    """Fan-out of permission invalidations to every worker's cache.
+
+    ``user_id=None`` means every cached entry of the event. Replace the in-process
+    channel with a broker-backed one (Redis pub/sub, Postgres NOTIFY, ...) through
+    ``set_invalidation_channel`` when running several workers.
+    """
+
+    @abstractmethod
+    def publish(self, event_id: int, user_id: Optional[int] = None) -> None:
+        """Send an invalidation to every worker's cache."""
+
+    @abstractmethod
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        """Call ``handler(event_id, user_id)`` for every invalidation the channel delivers."""
+
+class LocalInvalidationChannel(InvalidationChannel):
+    """In-process stand-in: delivers to subscribers in this process only."""
+
+    def __init__(self):
+        self._handlers: List[InvalidationHandler] = []
+
+    def publish(self, event_id: int, user_id: Optional[int] = None) -> None:
+        for handler in list(self._handlers):
+            handler(event_id, user_id)
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+class PermissionCache:
+    """Per-process LRU of ``(event_id, user_id) -> role``, including "no access" entries.
+
+    Negative entries get a shorter TTL. Lookups hand out a generation number, and a value
+    read from the database is only stored if no invalidation happened since, so a read
+    racing with a permission change cannot re-cache the old role.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int, negative_ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: "OrderedDict[PermissionKey, Tuple[Optional[RoleEnum], float]]" = OrderedDict()
+        self._lock = Lock()
+        self._generation = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, event_id: int, user_id: int) -> Tuple[Any, int]:
+        """``(role or None, generation)``; the role is ``MISSING`` on a cache miss."""
+        key = (event_id, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING, self._generation
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if entry[0] is None:
+                self.negative_hits += 1
+            return entry[0], self._generation
+
+    def put(self, event_id: int, user_id: int, role: Optional[RoleEnum], generation: int) -> None:
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl_seconds if role is not None else self.negative_ttl_seconds
+        with self._lock:
+            if generation != self._generation:
+                return
+            key = (event_id, user_id)
+            self._entries[key] = (role, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def drop(self, event_id: int, user_id: Optional[int] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if user_id is not None:
+                self._entries.pop((event_id, user_id), None)
+            else:
+                for key in [key for key in self._entries if key[0] == event_id]:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+permission_cache = PermissionCache(
+    settings.PERMISSION_CACHE_MAX_SIZE,
+    settings.PERMISSION_CACHE_TTL_SECONDS,
+    settings.PERMISSION_CACHE_NEGATIVE_TTL_SECONDS,
+)
+
+# The local cache is always dropped directly, so it only subscribes to channels that
+# carry invalidations from other workers
+_channel: InvalidationChannel = LocalInvalidationChannel()
+
+def set_invalidation_channel(channel: InvalidationChannel) -> None:
+    global _channel
+    channel.subscribe(permission_cache.drop)
+    _channel = channel
+
+def invalidate_permission(event_id: int, user_id: Optional[int] = None) -> None:
+    """Drop cached roles locally and tell the other workers; call after the write commits."""
+    permission_cache.drop(event_id, user_id)
+    _channel.publish(event_id, user_id)
@@ -0,0 +1,237 @@
+import calendar
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+
+Occurrence = Tuple[datetime, datetime]
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """Supported RRULE subset: FREQ, INTERVAL, COUNT, UNTIL and BYDAY (weekly only)."""
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byday: Tuple[int, ...] = ()
+
+def _parse_until(value: str) -> datetime:
+    value = value.rstrip("Z")
+    try:
+        return datetime.strptime(value, "%Y%m%dT%H%M%S")
+    except ValueError:
+        pass
+    try:
+        # A date-only UNTIL includes every occurrence on that day
+        return datetime.strptime(value, "%Y%m%d") + timedelta(days=1, microseconds=-1)
+    except ValueError:
+        raise ValueError(f"Invalid UNTIL value: {value}")
+
+def parse_rrule(pattern: str) -> RecurrenceRule:
+    """Parse ``FREQ=WEEKLY;BYDAY=MO,WE`` style patterns (optionally prefixed with ``RRULE:``).
+
+    Bare frequencies such as ``weekly`` are accepted as shorthand for ``FREQ=WEEKLY``.
+    """
+    text = pattern.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[len("RRULE:"):]
+    if text.upper() in FREQUENCIES:
+        return RecurrenceRule(freq=text.upper())
+
+    parts: Dict[str, str] = {}
+    for part in filter(None, text.split(";")):
+        key, sep, value = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid recurrence rule part: {part}")
+        parts[key.strip().upper()] = value.strip()
+
+    freq = parts.pop("FREQ", "").upper()
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unsupported recurrence frequency: {freq or 'missing'}")
+    interval = int(parts.pop("INTERVAL", "1"))
+    if interval < 1:
+        raise ValueError("INTERVAL must be positive")
+    count = int(parts.pop("COUNT")) if "COUNT" in parts else None
+    if count is not None and count < 1:
+        raise ValueError("COUNT must be positive")
+    until = _parse_until(parts.pop("UNTIL")) if "UNTIL" in parts else None
+    if count is not None and until is not None:
+        raise ValueError("COUNT and UNTIL cannot both be set")
+
+    byday: Tuple[int, ...] = ()
+    if "BYDAY" in parts:
+        if freq != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        try:
+            byday = tuple(sorted({WEEKDAYS[day.strip().upper()] for day in parts.pop("BYDAY").split(",")}))
+        except KeyError as e:
+            raise ValueError(f"Invalid BYDAY value: {e.args[0]}")
+    if parts:
+        raise ValueError(f"Unsupported recurrence rule parts: {', '.join(sorted(parts))}")
+    return RecurrenceRule(freq=freq, interval=interval, count=count, until=until, byday=byday)
+
+def _add_months(value: datetime, months: int) -> Optional[datetime]:
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > calendar.monthrange(year, month)[1]:
+        return None
+    return value.replace(year=year, month=month)
+
+def _iter_starts(dtstart: datetime, rule: RecurrenceRule, not_before: datetime) -> Iterator[Tuple[int, datetime]]:
+    """Yield ``(index, start)`` for every occurrence, skipping ahead to ``not_before`` when cheap."""
+    if rule.freq in ("DAILY", "WEEKLY") and not rule.byday:
+        step = timedelta(days=rule.interval * (7 if rule.freq == "WEEKLY" else 1))
+        index = max(0, (not_before - dtstart) // step)
+        while True:
+            yield index, dtstart + index * step
+            index += 1
+
+    elif rule.freq == "WEEKLY":
+        step = timedelta(weeks=rule.interval)
+        week_start = dtstart - timedelta(days=dtstart.weekday())
+        first_week = [day for day in rule.byday if day >= dtstart.weekday()]
+        week = max(0, (not_before - week_start) // step)
+        index = 0 if week == 0 else len(first_week) + (week - 1) * len(rule.byday)
+        while True:
+            for day in (first_week if week == 0 else rule.byday):
+                yield index, week_start + week * step + timedelta(days=day)
+                index += 1
+            week += 1
+
+    else:
+        months = rule.interval * (12 if rule.freq == "YEARLY" else 1)
+        index, period = 0, 0
+        while True:
+            start = _add_months(dtstart, period * months)
+            period += 1
+            if start is None:
+                continue
+            yield index, start
+            index += 1
+
+def iter_occurrences(
+    start_time: datetime,
+    end_time: datetime,
+    rule: RecurrenceRule,
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[Occurrence]:
+    """Lazily yield occurrences of a series that overlap [window_start, window_end)."""
+    duration = end_time - start_time
+    emitted = 0
+    for index, occurrence_start in _iter_starts(start_time, rule, window_start - duration):
+        if rule.count is not None and index >= rule.count:
+            return
+        if rule.until is not None and occurrence_start > rule.until:
+            return
+        if occurrence_start >= window_end:
+            return
+        occurrence_end = occurrence_start + duration
+        if occurrence_end > window_start:
+            yield occurrence_start, occurrence_end
+            emitted += 1
+            if emitted >= settings.RECURRENCE_MAX_OCCURRENCES:
+                return
+
+def expand_pattern(
+    start_time: datetime,
+    end_time: datetime,
+    pattern: str,
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[Occurrence]:
+    """Uncached expansion of a stored pattern over [window_start, window_end)."""
+    try:
+        rule = parse_rrule(pattern)
+    except ValueError:
+        # Legacy free-text patterns predate validation; treat them as a single occurrence
+        if start_time < window_end and end_time > window_start:
+            yield start_time, end_time
+        return
+    yield from iter_occurrences(start_time, end_time, rule, window_start, window_end)
+
+class OccurrenceCache:
+    """Per-event LRU of expanded occurrence windows.
+
+    Entries are keyed by the series definition as well as the window, so a stale entry
+    can never be served for an edited event even if explicit invalidation was missed.
+    """
+
+    def __init__(self, max_events: int, windows_per_event: int):
+        self.max_events = max_events
+        self.windows_per_event = windows_per_event
+        self._events: "OrderedDict[int, OrderedDict]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, event_id: int, key: tuple) -> Optional[List[Occurrence]]:
+        with self._lock:
+            windows = self._events.get(event_id)
+            if windows is not None and key in windows:
+                windows.move_to_end(key)
+                self._events.move_to_end(event_id)
+                self.hits += 1
+                return windows[key]
+            self.misses += 1
+            return None
+
+    def _store(self, event_id: int, key: tuple, occurrences: List[Occurrence]) -> None:
+        if self.max_events <= 0:
+            return
+        with self._lock:
+            windows = self._events.setdefault(event_id, OrderedDict())
+            windows[key] = occurrences
+            while len(windows) > self.windows_per_event:
+                windows.popitem(last=False)
+            self._events.move_to_end(event_id)
+            while len(self._events) > self.max_events:
+                self._events.popitem(last=False)
+
+    def expand(
+        self,
+        event_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        pattern: str,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> Iterator[Occurrence]:
+        key = (start_time, end_time, pattern, window_start, window_end)
+        cached = self._lookup(event_id, key)
+        if cached is not None:
+            yield from cached
+            return
+        produced: List[Occurrence] = []
+        for occurrence in expand_pattern(start_time, end_time, pattern, window_start, window_end):
+            produced.append(occurrence)
+            yield occurrence
+        # Only a fully consumed expansion is complete enough to cache
+        self._store(event_id, key, produced)
+
+    def invalidate(self, event_id: int) -> None:
+        with self._lock:
+            self._events.pop(event_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"events": len(self._events), "hits": self.hits, "misses": self.misses}
+
+occurrence_cache = OccurrenceCache(
+    settings.RECURRENCE_CACHE_MAX_EVENTS, settings.RECURRENCE_CACHE_WINDOWS_PER_EVENT
+)
+
+def expand_event(event, window_start: datetime, window_end: datetime) -> Iterator[Occurrence]:
+    """Occurrences of ``event`` inside the window; non-recurring events yield their own range."""
+    if not event.is_recurring or not event.recurrence_pattern:
+        if event.start_time < window_end and event.end_time > window_start:
+            yield event.start_time, event.end_time
+        return
+    yield from occurrence_cache.expand(
+        event.id, event.start_time, event.end_time, event.recurrence_pattern, window_start, window_end
+    )
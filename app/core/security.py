@@ -1,45 +1,106 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from threading import BoundedSemaphore, Lock
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from typing import Optional
+from uuid import uuid4
+from app.core.config import settings
 
 SECRET_KEY = "supersecretkey"  
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 REFRESH_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS
+)
 
-def hash_password(password: str) -> str:
+_hash_executor: Optional[Executor] = None
+_hash_executor_lock = Lock()
+# Counts running + queued hashing jobs; once exhausted new callers are rejected
+_hash_slots = BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            if settings.PASSWORD_HASH_EXECUTOR == "process":
+                _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+            else:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="pwd-hash"
+                )
+        return _hash_executor
+
+def shutdown_password_hasher() -> None:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=False, cancel_futures=True)
+            _hash_executor = None
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_password(plain_password: str, hash_password: str) -> bool:
-    return pwd_context.verify(plain_password, hash_password)
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+async def _run_hasher(func, *args):
+    """Run a hashing job on the pool and await it without blocking the event loop.
+
+    Called straight from the auth routes, outside run_db, so a slow hash never holds a DB
+    worker slot or a pooled connection.
+    """
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests, try again shortly",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
+    try:
+        return await asyncio.wrap_future(_get_hash_executor().submit(func, *args))
+    finally:
+        _hash_slots.release()
+
+async def hash_password(password: str) -> str:
+    return await _run_hasher(_hash, password)
+
+async def verify_password(plain_password: str, hash_password: str) -> bool:
+    return await _run_hasher(_verify, plain_password, hash_password)
 
 def create_access_token(data:dict, expires_delta: timedelta | None= None, scope: str = "access_token"):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire, "scope": scope})
+    to_encode.update({"exp": expire, "scope": scope, "jti": uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire, "scope": "refresh_token"})
+    to_encode.update({"exp": expire, "scope": "refresh_token", "jti": uuid4().hex})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def verify_token(token:str, scope: str = "access_token"):
+def decode_token(token: str, scope: str = "access_token") -> Optional[dict]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         token_scope = payload.get("scope")
         if token_scope != scope:
             raise JWTError("Invalid token scope")
-        user_id: int = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None:
             raise JWTError("Missing subject")
-        return user_id
+        return payload
     except JWTError:
         return None
+
+def verify_token(token:str, scope: str = "access_token"):
+    payload = decode_token(token, scope)
+    if payload is None:
+        return None
+    user_id: int = payload.get("sub")
+    return user_id
     
 def get_token_expiration(token: str) -> Optional[datetime]:
     try:
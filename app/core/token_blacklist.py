@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Dict, Optional
+from anyio import to_thread
+from app.core.config import settings
+from app.core.token_cache import token_digest
+from app.db.base import SessionLocal
+from app.repositories.user_respository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+def _to_timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+class TokenBlacklistStore:
+    """In-memory mirror of ``token_blacklist`` keyed by token digest.
+
+    Answers the common "not revoked" case without touching the database. The set is
+    loaded at startup and refreshed from every non-expired row on each sync. A revocation
+    made on another worker is therefore only honoured here after the next sync, up to
+    TOKEN_BLACKLIST_SYNC_SECONDS later.
+
+    Each sync re-reads all live rows rather than those past an id watermark: ids are handed
+    out before commit, so concurrent logouts can commit out of id order and a watermark would
+    skip the lower id for good. The table only holds unexpired tokens once swept, so the
+    full read stays small.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, token: str) -> bool:
+        expires_at = self._revoked.get(token_digest(token))
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, digest: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._revoked[digest] = _to_timestamp(expires_at)
+
+    def sync(self, repo: UserRepository) -> int:
+        rows = repo.list_active_blacklisted_tokens()
+        now = time.time()
+        with self._lock:
+            # Merged rather than replaced, so a local revoke_token racing this read is kept
+            for digest, expires_at in rows:
+                self._revoked[digest] = _to_timestamp(expires_at)
+            for digest in [d for d, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[digest]
+        return len(rows)
+
+token_blacklist = TokenBlacklistStore()
+
+def revoke_token(repo: UserRepository, token: str, expires_at: datetime) -> None:
+    digest = token_digest(token)
+    repo.add_blacklisted_token(digest, expires_at)
+    token_blacklist.add(digest, expires_at)
+
+def load_token_blacklist() -> None:
+    db = SessionLocal()
+    try:
+        token_blacklist.sync(UserRepository(db))
+    finally:
+        db.close()
+
+def sweep_expired_tokens() -> int:
+    db = SessionLocal()
+    try:
+        repo = UserRepository(db)
+        removed = 0
+        while True:
+            deleted = repo.delete_expired_blacklisted_tokens(settings.TOKEN_BLACKLIST_SWEEP_BATCH_SIZE)
+            removed += deleted
+            if deleted < settings.TOKEN_BLACKLIST_SWEEP_BATCH_SIZE:
+                return removed
+    finally:
+        db.close()
+
+async def run_token_blacklist_worker() -> None:
+    last_sweep: Optional[float] = None
+    while True:
+        await asyncio.sleep(settings.TOKEN_BLACKLIST_SYNC_SECONDS)
+        try:
+            await to_thread.run_sync(load_token_blacklist)
+            now = time.monotonic()
+            if last_sweep is None or now - last_sweep >= settings.TOKEN_BLACKLIST_SWEEP_SECONDS:
+                removed = await to_thread.run_sync(sweep_expired_tokens)
+                last_sweep = now
+                if removed:
+                    logger.info("Purged %d expired blacklisted tokens", removed)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Token blacklist sync failed")
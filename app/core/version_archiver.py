@@ -0,0 +1,38 @@
+import asyncio
+import logging
+from anyio import to_thread
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.repositories.event_version_repository import EventVersionRepository
+
+logger = logging.getLogger(__name__)
+
+def compact_versions() -> dict:
+    db = SessionLocal()
+    try:
+        return EventVersionRepository(db).compact(settings.EVENT_VERSION_ARCHIVE_EVENTS_PER_RUN)
+    finally:
+        db.close()
+
+def version_archive_stats() -> dict:
+    db = SessionLocal()
+    try:
+        return EventVersionRepository(db).archive_stats()
+    finally:
+        db.close()
+
+async def run_version_archiver() -> None:
+    """Periodically move old event versions into compressed cold storage."""
+    while True:
+        try:
+            moved = await to_thread.run_sync(compact_versions)
+            if moved["versions"]:
+                logger.info(
+                    "Archived %d versions of %d events (%d -> %d bytes)",
+                    moved["versions"], moved["events"], moved["raw_bytes"], moved["compressed_bytes"],
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Version compaction failed")
+        await asyncio.sleep(settings.EVENT_VERSION_ARCHIVE_INTERVAL_SECONDS)
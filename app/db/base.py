@@ -1,18 +1,94 @@
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+from anyio import CapacityLimiter, to_thread
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from app.core.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(DATABASE_URL, echo=True, future=True)
+def _engine_options() -> dict:
+    options = {
+        "echo": settings.DB_ECHO,
+        "future": True,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    if DATABASE_URL.startswith("sqlite"):
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    if DATABASE_URL.startswith("postgresql"):
+        connect_args = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+        if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        options["connect_args"] = connect_args
+    return options
+
+engine = create_engine(DATABASE_URL, **_engine_options())
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 Base = declarative_base()
 
+T = TypeVar("T")
+
+_db_limiter: Optional[CapacityLimiter] = None
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def warm_up_pool() -> None:
+    """Open DB_POOL_SIZE connections up front so the first requests don't pay for connects."""
+    connections = []
+    try:
+        for _ in range(settings.DB_POOL_SIZE):
+            connection = engine.connect()
+            connection.execute(text("SELECT 1"))
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+
+def pool_stats() -> dict:
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    stats["max_overflow"] = settings.DB_MAX_OVERFLOW
+    return stats
+
+def _get_db_limiter() -> CapacityLimiter:
+    global _db_limiter
+    if _db_limiter is None:
+        _db_limiter = CapacityLimiter(
+            settings.DB_THREADPOOL_SIZE or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        )
+    return _db_limiter
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking service/repository call from an async route.
+
+    With DB_RUN_IN_THREADPOOL enabled the call is executed on a bounded worker
+    thread so a slow query does not stall the event loop; otherwise it runs inline.
+    """
+    if not settings.DB_RUN_IN_THREADPOOL:
+        return func(*args, **kwargs)
+    return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=_get_db_limiter())
+
+async def run_db_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Like run_db, but always on a worker thread.
+
+    Needed by calls that pull data back from the event loop (``anyio.from_thread``),
+    such as imports that read the request body while writing to the database.
+    """
+    return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=_get_db_limiter())
@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.db.base import engine as default_engine
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextmanager
+def count_queries(engine: Engine = default_engine) -> Iterator[QueryCounter]:
+    """Count SQL statements executed on ``engine`` inside the block.
+
+    Used to check that an endpoint's query count stays flat as its result size grows.
+    """
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
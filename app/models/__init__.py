@@ -3,6 +3,8 @@ from app.models.event import Event
 from app.models.permission import Permission
 from app.models.event_version import EventVersion
 from app.models.changelog import Changelog
+from app.models.event_occurrence import EventOccurrence
+from app.models.event_version_archive import EventVersionArchive
 
 # Optional: list of all models
-__all__ = ["User", "Event", "Permission", "EventVersion", "Changelog"]
+__all__ = ["User", "Event", "Permission", "EventVersion", "Changelog", "EventOccurrence", "EventVersionArchive"]
@@ -1,9 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, JSON
-from sqlalchemy.orm import relationship
-from datetime import datetime
-from app.db.base import Base
-
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, JSON
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, String, JSON
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -14,10 +9,14 @@ class Changelog(Base):
     id = Column(Integer, primary_key=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=True)      # fix
     version_id = Column(Integer, nullable=True)                              # fix
+    # Version this entry describes; changes holds its {"field": {"from", "to"}} step diff
+    version_number = Column(Integer, nullable=True)
     changes = Column(JSON, nullable=True)                                    # fix
     description = Column(String, nullable=True)                              # fix
     created_at = Column(DateTime, default=datetime.utcnow, nullable=True)    # fix
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)      # fix
 
+    __table_args__ = (Index("ix_changelogs_event_version", "event_id", "version_number"),)
+
     event = relationship("Event", back_populates="changelogs")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -14,12 +14,23 @@ class Event(Base):
     location = Column(String)
     is_recurring = Column(Boolean, default=False)
     recurrence_pattern = Column(String)
+    # Number of the latest event_versions row; bumped atomically by EventRepository.record_version
+    current_version = Column(Integer, nullable=False, default=1, server_default="1")
 
     owner_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Transient, not persisted: caller's role (access-scoped listings) and ids of
+    # overlapping events found in warn-mode conflict checks
+    role = None
+    conflicts = None
+
     owner = relationship("User", back_populates="events")
     permissions = relationship("Permission", back_populates="event", cascade="all, delete")
     versions = relationship("EventVersion", back_populates="event", cascade="all, delete")
     changelogs = relationship("Changelog", back_populates="event", cascade="all, delete")
+
+    __table_args__ = (Index("ix_events_owner_start_id", "owner_id", "start_time", "id"),)
+    # A GiST index on tsrange(start_time, end_time) (ix_events_time_range) is created by
+    # migration only, since it is Postgres-specific; see EventRepository.find_overlapping.
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+from app.db.base import Base
+
+class EventOccurrence(Base):
+    """Precomputed occurrence of a recurring event, kept up to a rolling horizon.
+
+    Only maintained when OCCURRENCE_STORE_ENABLED is set; see OccurrenceRepository.
+    """
+    __tablename__ = "event_occurrences"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_event_occurrences_event_start", "event_id", "start_time"),
+        Index("ix_event_occurrences_start_time", "start_time"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, JSON
+from sqlalchemy import Boolean, Column, Integer, ForeignKey, DateTime, Index, JSON, UniqueConstraint, true
 from sqlalchemy.orm import relationship, backref
 from datetime import datetime
 from app.db.base import Base
@@ -10,10 +10,17 @@ class EventVersion(Base):
     event_id = Column(Integer, ForeignKey("events.id"))
     version_number = Column(Integer, nullable=False)
     version_data = Column(JSON, nullable=False)
+    # Snapshots hold every versioned field; other versions hold only the fields that changed
+    is_snapshot = Column(Boolean, nullable=False, default=True, server_default=true())
     created_at = Column(DateTime, default=datetime.utcnow)
     created_by = Column(Integer, ForeignKey("users.id"))
     previous_version_id = Column(Integer, ForeignKey("event_versions.id"), nullable=True)
 
+    __table_args__ = (
+        Index("ix_event_versions_event_snapshot", "event_id", "is_snapshot", "version_number"),
+        UniqueConstraint("event_id", "version_number", name="uix_event_versions_event_version"),
+    )
+
     event = relationship("Event", back_populates="versions")
     created_by_user = relationship("User")
 
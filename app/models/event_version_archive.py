@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, LargeBinary, String
+from datetime import datetime
+from app.db.base import Base
+
+class EventVersionArchive(Base):
+    """Compressed batch of an event's oldest versions, moved out of ``event_versions``.
+
+    Written by the version compaction job; see EventVersionRepository.archive_event.
+    """
+    __tablename__ = "event_version_archives"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    first_version = Column(Integer, nullable=False)
+    last_version = Column(Integer, nullable=False)
+    # Range of the archived event_versions ids, for lookups by version id
+    min_version_id = Column(Integer, nullable=False)
+    max_version_id = Column(Integer, nullable=False)
+    version_count = Column(Integer, nullable=False)
+    codec = Column(String(16), nullable=False, default="zlib")
+    payload = Column(LargeBinary, nullable=False)
+    raw_bytes = Column(Integer, nullable=False)
+    compressed_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_event_version_archives_event_versions", "event_id", "first_version", "last_version"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Enum, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import enum
@@ -19,4 +19,8 @@ class Permission(Base):
     user = relationship("User", back_populates="permissions")
     event = relationship("Event", back_populates="permissions")
 
-    __table_args__ = (UniqueConstraint('user_id', 'event_id', name='uix_user_event'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'event_id', name='uix_user_event'),
+        # Keyset pages per role and per-role counts for GET /api/events/{event_id}/permissions
+        Index('ix_permissions_event_role_id', 'event_id', 'role', 'id'),
+    )
@@ -19,5 +19,5 @@ class TokenBlacklist(Base):
     __tablename__ = "token_blacklist"
 
     id = Column(Integer, primary_key=True, index=True)
-    token = Column(String, unique=True, index=True, nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)  # sha256 hex digest
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,13 @@
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Collection, Dict, List, Optional, Set, Tuple
+from app.core.change_feed import event_topic, permission_message, queue_change, user_topic
+from app.core.permission_cache import MISSING, permission_cache
 from app.models.permission import Permission, RoleEnum
+from app.models.user import User
+from itertools import islice
+import heapq
 from fastapi import HTTPException, status
 
 class CollaborationRepository:
@@ -17,28 +24,130 @@ class CollaborationRepository:
         except Exception:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch permission")
 
+    def get_role(self, event_id: int, user_id: int) -> Optional[RoleEnum]:
+        """The user's role on the event (None without access), served from the permission cache."""
+        role, generation = permission_cache.get(event_id, user_id)
+        if role is not MISSING:
+            return role
+        try:
+            row = (
+                self.db.query(Permission.role)
+                .filter(Permission.event_id == event_id, Permission.user_id == user_id)
+                .first()
+            )
+        except Exception:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch permission")
+        role = RoleEnum(row.role) if row else None
+        permission_cache.put(event_id, user_id, role, generation)
+        return role
+
     def create_role(self, event_id: int, user_id: int, role: RoleEnum) -> Permission:
         try:
             permission = Permission(event_id=event_id, user_id=user_id, role=role)
             self.db.add(permission)
             self.db.flush() 
+            self._queue_permission_change(event_id, user_id, role)
             return permission
         except Exception:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create permission")
 
-    def list_by_event(self, event_id: int) -> List[Permission]:
+    def get_roles(self, pairs: Collection[Tuple[int, int]]) -> Dict[Tuple[int, int], RoleEnum]:
+        """Current roles for ``(event_id, user_id)`` pairs in one query; pairs without access are absent."""
+        if not pairs:
+            return {}
+        try:
+            rows = (
+                self.db.query(Permission.event_id, Permission.user_id, Permission.role)
+                .filter(tuple_(Permission.event_id, Permission.user_id).in_(list(pairs)))
+                .all()
+            )
+            return {(row.event_id, row.user_id): RoleEnum(row.role) for row in rows}
+        except Exception:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch permissions")
+
+    def existing_user_ids(self, user_ids: Collection[int]) -> Set[int]:
+        if not user_ids:
+            return set()
+        try:
+            rows = self.db.query(User.id).filter(User.id.in_(list(user_ids))).all()
+            return {row.id for row in rows}
+        except Exception:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch users")
+
+    def upsert_roles(self, entries: List[Tuple[int, int, RoleEnum]]) -> None:
+        """Insert or update ``(event_id, user_id, role)`` rows with one ``INSERT ... ON CONFLICT``.
+
+        The conflict target is ``uix_user_event``; an existing owner permission is never changed.
+        """
+        if not entries:
+            return
+        rows = [{"event_id": event_id, "user_id": user_id, "role": role} for event_id, user_id, role in entries]
         try:
-            return self.db.query(Permission).filter(Permission.event_id == event_id).all()
+            if self.db.get_bind().dialect.name == "postgresql":
+                stmt = postgresql.insert(Permission).values(rows)
+                target = {"constraint": "uix_user_event"}
+            else:
+                stmt = sqlite.insert(Permission).values(rows)
+                target = {"index_elements": [Permission.user_id, Permission.event_id]}
+            stmt = stmt.on_conflict_do_update(
+                set_={"role": stmt.excluded.role}, where=Permission.role != RoleEnum.owner, **target
+            )
+            self.db.execute(stmt)
+            for event_id, user_id, role in entries:
+                self._queue_permission_change(event_id, user_id, role)
+        except Exception:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to share event")
+
+    def list_by_event(
+        self,
+        event_id: int,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        role: Optional[RoleEnum] = None,
+    ) -> List[Permission]:
+        """Permissions of an event in ``id`` order, at most ``limit`` of them after ``after_id``.
+
+        Each role is read as its own range of ``ix_permissions_event_role_id`` and the ranges
+        are merged, so a page never sorts the event's whole permission list.
+        """
+        try:
+            ranges = []
+            for range_role in ([role] if role is not None else list(RoleEnum)):
+                query = self.db.query(Permission).filter(
+                    Permission.event_id == event_id, Permission.role == range_role
+                )
+                if after_id is not None:
+                    query = query.filter(Permission.id > after_id)
+                query = query.order_by(Permission.id.asc())
+                if limit is not None:
+                    query = query.limit(limit)
+                ranges.append(query.all())
+            return list(islice(heapq.merge(*ranges, key=lambda permission: permission.id), limit))
         except Exception:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list permissions")
 
+    def count_by_role(self, event_id: int) -> Dict[RoleEnum, int]:
+        """Per-role permission counts, answered from ``ix_permissions_event_role_id`` alone."""
+        try:
+            rows = (
+                self.db.query(Permission.role, func.count(Permission.id))
+                .filter(Permission.event_id == event_id)
+                .group_by(Permission.role)
+                .all()
+            )
+            return {RoleEnum(role): count for role, count in rows}
+        except Exception:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to count permissions")
+
     def update_role(self, event_id: int, user_id: int, role: RoleEnum) -> Optional[Permission]:
         try:
             share = self.get_by_event_and_user(event_id, user_id)
             if share:
                 share.role = role
                 self.db.flush()
+                self._queue_permission_change(event_id, user_id, role)
             return share
         except Exception:
             self.db.rollback()
@@ -50,8 +159,14 @@ class CollaborationRepository:
             if share:
                 self.db.delete(share)
                 self.db.flush()
+                self._queue_permission_change(event_id, user_id, None)
                 return True
             return False
         except Exception:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete permission")
+
+    def _queue_permission_change(self, event_id: int, user_id: int, role: Optional[RoleEnum]) -> None:
+        queue_change(
+            self.db, [event_topic(event_id), user_topic(user_id)], permission_message(event_id, user_id, role)
+        )
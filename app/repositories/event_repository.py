@@ -1,89 +1,491 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import and_, func, insert, literal, not_, or_, text, tuple_, update
+from sqlalchemy.orm import Session, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Collection, Iterator, List, Optional, Tuple
+from datetime import datetime
+from app.core.change_feed import deleted_message, event_topic, queue_change, version_message
+from app.core.config import settings
+from app.core.diff_cache import diff_cache
+from app.core.datetimes import to_naive_utc
+from app.core.recurrence import occurrence_cache
+from app.models.changelog import Changelog
 from app.models.event import Event
 from app.models.event_version import EventVersion
-from app.schemas.event import EventBase, EventUpdate
+from app.models.event_version_archive import EventVersionArchive
+from app.models.permission import Permission, RoleEnum
+from app.repositories.event_version_repository import is_snapshot_version, version_changes, version_delta, version_state
+from app.repositories.occurrence_repository import OccurrenceRepository
+from app.schemas.event import EventBase, EventUpdate, EventScope
+import csv
+import io
 import json
 from pydantic.json import pydantic_encoder
 from fastapi import HTTPException, status
 
+def history_options(include: Collection[str]) -> list:
+    """Loader options that bulk-load requested history relations and skip the rest."""
+    return [
+        selectinload(Event.versions) if "versions" in include else noload(Event.versions),
+        selectinload(Event.changelogs) if "changelogs" in include else noload(Event.changelogs),
+    ]
+
+IMPORT_STAGING_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS event_import_staging (
+    seq integer NOT NULL,
+    title text NOT NULL,
+    description text,
+    start_time timestamp NOT NULL,
+    end_time timestamp NOT NULL,
+    location text,
+    is_recurring boolean,
+    recurrence_pattern text
+)
+"""
+
+IMPORT_MERGE_SQL = """
+WITH inserted AS (
+    INSERT INTO events (title, description, start_time, end_time, location, is_recurring,
+                        recurrence_pattern, owner_id, created_at, updated_at)
+    SELECT title, description, start_time, end_time, location, is_recurring, recurrence_pattern,
+           :owner_id, timezone('utc', now()), timezone('utc', now())
+    FROM event_import_staging
+    ORDER BY seq
+    RETURNING id, title, description, start_time, end_time, location, is_recurring, recurrence_pattern
+), versions AS (
+    INSERT INTO event_versions (event_id, version_number, version_data, is_snapshot, created_at, created_by)
+    SELECT id, 1,
+           json_build_object(
+               'title', title, 'description', description,
+               'start_time', to_char(start_time, 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+               'end_time', to_char(end_time, 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+               'location', location, 'is_recurring', is_recurring,
+               'recurrence_pattern', recurrence_pattern
+           ),
+           true, timezone('utc', now()), :owner_id
+    FROM inserted
+), owner_permissions AS (
+    INSERT INTO permissions (user_id, event_id, role)
+    SELECT :owner_id, id, 'owner'::roleenum FROM inserted
+), changelog_entries AS (
+    INSERT INTO changelogs (event_id, version_number, changes, description, created_at, created_by)
+    SELECT id, 1, '{}'::json, 'Event created', timezone('utc', now()), :owner_id FROM inserted
+)
+SELECT id, is_recurring FROM inserted ORDER BY id
+"""
+
+SERIES_FIELDS = ("start_time", "end_time", "is_recurring", "recurrence_pattern")
+
 class EventRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def sync_occurrences(self, event: Event) -> None:
+        if settings.OCCURRENCE_STORE_ENABLED:
+            OccurrenceRepository(self.db).materialize(event)
+
     def create(self, owner_id: int, data: EventBase) -> Event:
         try:
             event = Event(**data.dict(), owner_id=owner_id)
             self.db.add(event)
             self.db.flush()
             self.create_event_version(event.id, 1, data.dict(), owner_id)
+            if event.is_recurring:
+                self.sync_occurrences(event)
             return event
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create event")
 
-    def get(self, event_id: int) -> Optional[Event]:
+    def get(
+        self, event_id: int, include: Optional[Collection[str]] = None, for_update: bool = False
+    ) -> Optional[Event]:
+        """Fetch one event; ``for_update`` row-locks it and reloads it so writers see the latest state."""
         try:
-            return self.db.query(Event).filter(Event.id == event_id).first()
+            if for_update and self.db.get_bind().dialect.name == "sqlite":
+                # SQLite ignores FOR UPDATE; a no-op write takes the database write lock instead,
+                # so the read below already sees the last committed writer
+                self.db.execute(
+                    update(Event).where(Event.id == event_id).values(current_version=Event.current_version)
+                    .execution_options(synchronize_session=False)
+                )
+            query = self.db.query(Event).filter(Event.id == event_id)
+            if include is not None:
+                query = query.options(*history_options(include)).populate_existing()
+            if for_update:
+                query = query.with_for_update().populate_existing()
+            return query.first()
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch event")
 
-    def list_by_user(self, user_id: int) -> List[Event]:
+    def get_many(self, event_ids: List[int], include: Collection[str] = ()) -> List[Event]:
+        try:
+            if not event_ids:
+                return []
+            return (
+                self.db.query(Event)
+                .filter(Event.id.in_(event_ids))
+                .options(*history_options(include))
+                .populate_existing()
+                .order_by(Event.id.asc())
+                .all()
+            )
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch events")
+
+    def list_by_user(
+        self,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+        is_recurring: Optional[bool] = None,
+        location: Optional[str] = None,
+        scope: EventScope = EventScope.owned,
+        include: Collection[str] = (),
+    ) -> List[Event]:
+        """Return one keyset page of events visible to ``user_id`` with ``event.role`` set.
+
+        Non-owned scopes resolve access and role in a single join against ``permissions``.
+        """
         try:
-            return self.db.query(Event).filter(Event.owner_id == user_id).all()
+            if scope == EventScope.owned:
+                query = self.db.query(Event, literal(RoleEnum.owner.value)).filter(Event.owner_id == user_id)
+            else:
+                query = self.db.query(Event, Permission.role).join(
+                    Permission, and_(Permission.event_id == Event.id, Permission.user_id == user_id)
+                )
+                if scope == EventScope.shared:
+                    query = query.filter(Permission.role != RoleEnum.owner)
+            if window_start is not None:
+                query = query.filter(Event.end_time > window_start)
+            if window_end is not None:
+                query = query.filter(Event.start_time < window_end)
+            if is_recurring is not None:
+                query = query.filter(Event.is_recurring.is_(is_recurring))
+            if location:
+                query = query.filter(Event.location.ilike(f"%{location}%"))
+            if after is not None:
+                query = query.filter(tuple_(Event.start_time, Event.id) > tuple_(*after))
+            rows = (
+                query.options(*history_options(include))
+                .order_by(Event.start_time.asc(), Event.id.asc())
+                .limit(limit)
+                .all()
+            )
+            events = []
+            for event, role in rows:
+                event.role = RoleEnum(role)
+                events.append(event)
+            return events
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list events")
 
-    def update(self, event_id: int, data: EventUpdate) -> Optional[Event]:
+    def _is_series(self):
+        return and_(Event.is_recurring.is_(True), Event.recurrence_pattern.isnot(None))
+
+    def _overlaps(self, start_time: datetime, end_time: datetime):
+        # Aware values would be bound as timestamptz, which tsrange(timestamp, timestamp) rejects
+        start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Matches the ix_events_time_range GiST expression index
+            return func.tsrange(Event.start_time, Event.end_time).op("&&")(func.tsrange(start_time, end_time))
+        return and_(Event.start_time < end_time, Event.end_time > start_time)
+
+    def find_overlapping(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_event_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        exclude_series: bool = False,
+    ) -> List[Tuple[int, str, datetime, datetime, RoleEnum]]:
+        """Events accessible to ``user_id`` whose [start_time, end_time) overlaps the range.
+
+        With ``exclude_series`` recurring events are skipped; callers expand those separately.
+        """
         try:
-            event = self.get(event_id)
+            query = (
+                self.db.query(Event.id, Event.title, Event.start_time, Event.end_time, Permission.role)
+                .join(Permission, and_(Permission.event_id == Event.id, Permission.user_id == user_id))
+                .filter(self._overlaps(start_time, end_time))
+            )
+            if exclude_series:
+                query = query.filter(not_(self._is_series()))
+            if exclude_event_id is not None:
+                query = query.filter(Event.id != exclude_event_id)
+            query = query.order_by(Event.start_time.asc(), Event.id.asc())
+            if limit is not None:
+                query = query.limit(limit)
+            return query.all()
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to check event conflicts")
+
+    def find_recurring_series(
+        self, user_id: int, before: datetime, exclude_event_id: Optional[int] = None
+    ) -> List[Tuple[int, str, datetime, datetime, RoleEnum, str]]:
+        """Accessible recurring events whose series starts before ``before``."""
+        try:
+            query = (
+                self.db.query(
+                    Event.id, Event.title, Event.start_time, Event.end_time,
+                    Permission.role, Event.recurrence_pattern
+                )
+                .join(Permission, and_(Permission.event_id == Event.id, Permission.user_id == user_id))
+                .filter(self._is_series(), Event.start_time < before)
+            )
+            if exclude_event_id is not None:
+                query = query.filter(Event.id != exclude_event_id)
+            return query.all()
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch recurring events")
+
+    def list_for_window(
+        self,
+        user_id: int,
+        window_start: datetime,
+        window_end: datetime,
+        scope: EventScope = EventScope.owned,
+        include_series: bool = True,
+    ) -> List[Event]:
+        """Events that may occur in the window: overlapping one-off events plus every series
+        that starts before the window ends. ``event.role`` is set as in ``list_by_user``."""
+        try:
+            if scope == EventScope.owned:
+                query = self.db.query(Event, literal(RoleEnum.owner.value)).filter(Event.owner_id == user_id)
+            else:
+                query = self.db.query(Event, Permission.role).join(
+                    Permission, and_(Permission.event_id == Event.id, Permission.user_id == user_id)
+                )
+                if scope == EventScope.shared:
+                    query = query.filter(Permission.role != RoleEnum.owner)
+            one_off = and_(not_(self._is_series()), self._overlaps(window_start, window_end))
+            if include_series:
+                query = query.filter(or_(one_off, and_(self._is_series(), Event.start_time < window_end)))
+            else:
+                query = query.filter(one_off)
+            events = []
+            for event, role in query.options(*history_options(())).all():
+                event.role = RoleEnum(role)
+                events.append(event)
+            return events
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list events in window")
+
+    def stream_by_user(
+        self,
+        user_id: int,
+        scope: EventScope = EventScope.accessible,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[tuple]:
+        """Yield plain column rows (plus ``role``) for every event visible to ``user_id``.
+
+        Rows are fetched ``batch_size`` at a time through a server-side cursor and never enter
+        the identity map, so memory stays flat however large the calendar is. With a window,
+        one-off events must overlap it and series must start before it ends.
+        """
+        columns = (
+            Event.id, Event.title, Event.description, Event.start_time, Event.end_time, Event.location,
+            Event.is_recurring, Event.recurrence_pattern, Event.updated_at,
+        )
+        if scope == EventScope.owned:
+            query = self.db.query(*columns, literal(RoleEnum.owner.value).label("role")).filter(Event.owner_id == user_id)
+        else:
+            query = self.db.query(*columns, Permission.role).join(
+                Permission, and_(Permission.event_id == Event.id, Permission.user_id == user_id)
+            )
+            if scope == EventScope.shared:
+                query = query.filter(Permission.role != RoleEnum.owner)
+        if window_start is not None and window_end is not None:
+            one_off = and_(not_(self._is_series()), self._overlaps(window_start, window_end))
+            query = query.filter(or_(one_off, and_(self._is_series(), Event.start_time < window_end)))
+        yield from query.order_by(Event.id.asc()).execution_options(yield_per=batch_size)
+
+    def update(self, event_id: int, data: EventUpdate, updated_by: int) -> Optional[Event]:
+        try:
+            event = self.get(event_id, for_update=True)
             if not event:
                 return None
+            previous_state = version_state(event)
             for field, value in data.dict(exclude_unset=True).items():
                 if value is not None:
                     setattr(event, field, value)
             self.db.flush()
-            latest_version = (
-                self.db.query(EventVersion)
-                .filter(EventVersion.event_id == event_id)
-                .order_by(EventVersion.version_number.desc())
-                .first()
-            )
-            next_version = 1 if not latest_version else latest_version.version_number + 1
-            self.create_event_version(event_id, next_version, data.dict(exclude_unset=True), event.owner_id)
+            occurrence_cache.invalidate(event_id)
+            if set(data.dict(exclude_unset=True)) & set(SERIES_FIELDS):
+                self.sync_occurrences(event)
+            self.record_version(event, previous_state, updated_by)
             return event
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update event")
 
-    def create_batch(self, events_data: List[EventBase], owner_id: int) -> List[Event]:
+    def record_version(
+        self, event: Event, previous_state: dict, created_by: int, description: str = "Event updated"
+    ) -> EventVersion:
+        """Append the next version of ``event``: a full snapshot every EVENT_VERSION_SNAPSHOT_INTERVAL
+        versions and otherwise only the fields that changed since ``previous_state``.
+
+        The field-level diff is written to the version's changelog entry at the same time, so
+        diffs between versions can be composed later without loading version payloads.
+        """
+        # Atomic increment: the row lock serializes concurrent writers on the same event
+        next_version = self.db.execute(
+            update(Event)
+            .where(Event.id == event.id)
+            .values(current_version=Event.current_version + 1)
+            .returning(Event.current_version)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+        set_committed_value(event, "current_version", next_version)
+        state = version_state(event)
+        if is_snapshot_version(next_version):
+            version = self.create_event_version(event.id, next_version, state, created_by)
+        else:
+            version = self.create_event_version(
+                event.id, next_version, version_delta(previous_state, state), created_by, is_snapshot=False
+            )
+        changes = version_changes(previous_state, state)
+        self.db.add(Changelog(
+            event_id=event.id,
+            version_id=version.id,
+            version_number=next_version,
+            changes=changes,
+            description=description,
+            created_by=created_by,
+        ))
+        queue_change(
+            self.db, [event_topic(event.id)],
+            version_message(event.id, next_version, changes, description, created_by)
+        )
+        return version
+
+    def _bulk_insert_chunk(self, events_data: List[EventBase], owner_id: int) -> List[int]:
+        """Insert events plus their v1 version, owner permission and changelog.
+
+        Each table is written with one multi-row INSERT (insertmanyvalues), so a chunk
+        costs four round-trips regardless of its size.
+        """
+        payloads = [json.loads(json.dumps(data.dict(), default=pydantic_encoder)) for data in events_data]
+        event_ids = self.db.scalars(
+            insert(Event).returning(Event.id, sort_by_parameter_order=True),
+            [{**data.dict(), "owner_id": owner_id} for data in events_data],
+        ).all()
+        self.db.execute(insert(EventVersion), [
+            {"event_id": event_id, "version_number": 1, "version_data": payload, "is_snapshot": True, "created_by": owner_id}
+            for event_id, payload in zip(event_ids, payloads)
+        ])
+        self.db.execute(insert(Permission), [
+            {"event_id": event_id, "user_id": owner_id, "role": RoleEnum.owner} for event_id in event_ids
+        ])
+        self.db.execute(insert(Changelog), [
+            {"event_id": event_id, "version_id": None, "version_number": 1, "changes": {}, "description": "Event created", "created_by": owner_id}
+            for event_id in event_ids
+        ])
+        if settings.OCCURRENCE_STORE_ENABLED:
+            for event_id, data in zip(event_ids, events_data):
+                if data.is_recurring:
+                    self.sync_occurrences(Event(id=event_id, **data.dict()))
+        return event_ids
+
+    def create_batch(
+        self, events_data: List[EventBase], owner_id: int, chunk_size: int = 1000
+    ) -> List[Tuple[int, Optional[int], Optional[str]]]:
+        """Bulk-create events in chunks; returns ``(index, event_id, error)`` per input item.
+
+        Each chunk runs in a savepoint. If a chunk fails, its items are retried one by one
+        so only the offending items are reported as failed.
+        """
+        results = []
         try:
-            events = [Event(**data.dict(), owner_id=owner_id) for data in events_data]
-            self.db.add_all(events)
-            self.db.flush()
-            return events
+            for offset in range(0, len(events_data), chunk_size):
+                chunk = events_data[offset:offset + chunk_size]
+                try:
+                    with self.db.begin_nested():
+                        event_ids = self._bulk_insert_chunk(chunk, owner_id)
+                    results.extend((offset + i, event_id, None) for i, event_id in enumerate(event_ids))
+                except Exception:
+                    for i, data in enumerate(chunk):
+                        try:
+                            with self.db.begin_nested():
+                                [event_id] = self._bulk_insert_chunk([data], owner_id)
+                            results.append((offset + i, event_id, None))
+                        except Exception as e:
+                            results.append((offset + i, None, str(getattr(e, "orig", e))))
+            return results
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create batch events")
 
+    def copy_import_chunk(self, events_data: List[EventBase], owner_id: int) -> List[int]:
+        """Load a validated import chunk with COPY into a staging table, then merge it into
+        events, event_versions, permissions and changelogs with one statement.
+
+        Falls back to the multi-row INSERT path on databases without COPY.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self._bulk_insert_chunk(events_data, owner_id)
+        try:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for seq, data in enumerate(events_data):
+                writer.writerow([
+                    seq, data.title, data.description, data.start_time.isoformat(), data.end_time.isoformat(),
+                    data.location, bool(data.is_recurring), data.recurrence_pattern,
+                ])
+            buffer.seek(0)
+
+            self.db.execute(text(IMPORT_STAGING_DDL))
+            self.db.execute(text("TRUNCATE event_import_staging"))
+            cursor = self.db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    "COPY event_import_staging (seq, title, description, start_time, end_time, location, "
+                    "is_recurring, recurrence_pattern) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+            finally:
+                cursor.close()
+            rows = self.db.execute(text(IMPORT_MERGE_SQL), {"owner_id": owner_id}).all()
+            event_ids = [row.id for row in rows]
+            if settings.OCCURRENCE_STORE_ENABLED:
+                for event in self.get_many([row.id for row in rows if row.is_recurring]):
+                    self.sync_occurrences(event)
+            return event_ids
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to import events")
+
     def delete(self, event_id: int) -> bool:
         try:
             event = self.get(event_id)
             if not event:
                 return False
+            if settings.OCCURRENCE_STORE_ENABLED:
+                OccurrenceRepository(self.db).delete_for_event(event_id)
+            self.db.query(EventVersionArchive).filter(EventVersionArchive.event_id == event_id).delete(synchronize_session=False)
             self.db.delete(event)
             self.db.flush()
+            occurrence_cache.invalidate(event_id)
+            diff_cache.invalidate_event(event_id)
+            queue_change(self.db, [event_topic(event_id)], deleted_message(event_id))
             return True
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete event")
 
-    def create_event_version(self, event_id: int, version_number: int, data: dict, created_by: int) -> EventVersion:
+    def create_event_version(
+        self, event_id: int, version_number: int, data: dict, created_by: int, is_snapshot: bool = True
+    ) -> EventVersion:
         try:
             version = EventVersion(
                 event_id=event_id,
                 version_number=version_number,
                 version_data=json.loads(json.dumps(data, default=pydantic_encoder)),
+                is_snapshot=is_snapshot,
                 created_by=created_by
             )
             self.db.add(version)
@@ -1,25 +1,142 @@
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.event_version import EventVersion
-from typing import Optional, List
+from app.models.event_version_archive import EventVersionArchive
+from app.models.changelog import Changelog
+from typing import Any, Dict, Optional, List
 from fastapi import HTTPException, status
+from pydantic.json import pydantic_encoder
+from datetime import datetime, timedelta
+import json
+import zlib
+
+VERSIONED_FIELDS = (
+    "title", "description", "start_time", "end_time", "location", "is_recurring", "recurrence_pattern"
+)
+
+def version_state(event) -> Dict[str, Any]:
+    """JSON-ready values of every versioned field of ``event``."""
+    return json.loads(json.dumps({field: getattr(event, field) for field in VERSIONED_FIELDS}, default=pydantic_encoder))
+
+def version_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: value for field, value in current.items() if previous.get(field) != value}
+
+def version_changes(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Field-level step diff in the ``{"field": {"from": old, "to": new}}`` shape used by changelogs."""
+    return {field: {"from": previous.get(field), "to": value} for field, value in version_delta(previous, current).items()}
+
+def compose_changes(steps: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Collapse consecutive step diffs into one, dropping fields that ended where they started."""
+    composed: Dict[str, Dict[str, Any]] = {}
+    for step in steps:
+        for field, change in step.items():
+            if field in composed:
+                composed[field]["to"] = change["to"]
+            else:
+                composed[field] = {"from": change["from"], "to": change["to"]}
+    return {field: change for field, change in composed.items() if change["from"] != change["to"]}
+
+def is_snapshot_version(version_number: int) -> bool:
+    return (version_number - 1) % max(settings.EVENT_VERSION_SNAPSHOT_INTERVAL, 1) == 0
+
+def _encode_versions(versions: List[EventVersion]) -> bytes:
+    rows = [
+        {
+            "id": version.id,
+            "version_number": version.version_number,
+            "version_data": version.version_data,
+            "is_snapshot": version.is_snapshot,
+            "created_at": version.created_at.isoformat() if version.created_at else None,
+            "created_by": version.created_by,
+            "previous_version_id": version.previous_version_id,
+        }
+        for version in versions
+    ]
+    return json.dumps(rows, separators=(",", ":")).encode("utf-8")
+
+def _decode_archive(archive: EventVersionArchive) -> List[dict]:
+    if archive.codec != "zlib":
+        raise ValueError(f"Unsupported archive codec: {archive.codec}")
+    return json.loads(zlib.decompress(archive.payload))
+
+def _archived_version(event_id: int, row: dict) -> EventVersion:
+    """Detached, read-only EventVersion rebuilt from an archived row."""
+    return EventVersion(
+        id=row["id"],
+        event_id=event_id,
+        version_number=row["version_number"],
+        version_data=row["version_data"],
+        is_snapshot=row["is_snapshot"],
+        created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else None,
+        created_by=row["created_by"],
+        previous_version_id=row["previous_version_id"],
+    )
 
 class EventVersionRepository:
     def __init__(self, db: Session):
         self.db = db
 
     def get_by_id(self, event_id: int, version_id: int) -> Optional[EventVersion]:
+        """Fetch a version by id, falling back to the compressed archive for cold versions."""
         try:
-            return (
+            version = (
                 self.db.query(EventVersion)
                 .filter(EventVersion.id == version_id, EventVersion.event_id == event_id)
                 .first()
             )
+            if version is not None:
+                return version
+            archives = self.db.query(EventVersionArchive).filter(
+                EventVersionArchive.event_id == event_id,
+                EventVersionArchive.min_version_id <= version_id,
+                EventVersionArchive.max_version_id >= version_id,
+            )
+            for archive in archives:
+                for row in _decode_archive(archive):
+                    if row["id"] == version_id:
+                        return _archived_version(event_id, row)
+            return None
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch version")
 
+    def get_version_numbers(self, event_id: int, version_ids: List[int]) -> Dict[int, int]:
+        """Map version ids of the event to their numbers without loading version payloads.
+
+        Hot versions and changelog entries answer from their columns; an archive blob is only
+        decompressed for an archived version with no changelog entry.
+        """
+        try:
+            numbers = dict(
+                self.db.query(EventVersion.id, EventVersion.version_number)
+                .filter(EventVersion.event_id == event_id, EventVersion.id.in_(version_ids))
+                .all()
+            )
+            missing = [version_id for version_id in version_ids if version_id not in numbers]
+            if missing:
+                numbers.update(
+                    self.db.query(Changelog.version_id, Changelog.version_number)
+                    .filter(
+                        Changelog.event_id == event_id,
+                        Changelog.version_id.in_(missing),
+                        Changelog.version_number.isnot(None),
+                    )
+                    .all()
+                )
+            for version_id in version_ids:
+                if version_id not in numbers:
+                    version = self.get_by_id(event_id, version_id)
+                    if version is not None:
+                        numbers[version_id] = version.version_number
+            return numbers
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch versions")
+
     def list_versions(self, event_id: int) -> List[EventVersion]:
         try:
-            return self.db.query(EventVersion).filter(EventVersion.event_id == event_id).all()
+            return self._archived_versions(event_id) + self.db.query(EventVersion).filter(EventVersion.event_id == event_id).all()
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list versions")
 
@@ -34,9 +151,21 @@ class EventVersionRepository:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create version")
 
+    def _archived_versions(self, event_id: int) -> List[EventVersion]:
+        archives = (
+            self.db.query(EventVersionArchive)
+            .filter(EventVersionArchive.event_id == event_id)
+            .order_by(EventVersionArchive.first_version.asc())
+        )
+        versions = []
+        for archive in archives:
+            versions.extend(_archived_version(event_id, row) for row in _decode_archive(archive))
+        return sorted(versions, key=lambda version: version.version_number)
+
     def get_versions_by_event(self, event_id: int) -> List[EventVersion]:
+        """All versions in order, archived ones first (versions are archived oldest first)."""
         try:
-            return (
+            return self._archived_versions(event_id) + (
                 self.db.query(EventVersion)
                 .filter(EventVersion.event_id == event_id)
                 .order_by(EventVersion.version_number.asc())
@@ -44,3 +173,268 @@ class EventVersionRepository:
             )
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch versions")
+
+    def list_versions_page(
+        self,
+        event_id: int,
+        limit: int,
+        after_version: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        created_by: Optional[int] = None,
+        include_data: bool = True,
+    ) -> List[Any]:
+        """Up to ``limit`` versions after ``after_version`` in version order, archived ones included.
+
+        Without ``include_data`` hot rows are read without ``version_data`` at all.
+        """
+        try:
+            def matches(created_at: Optional[datetime], author: Optional[int]) -> bool:
+                if since is not None and (created_at is None or created_at < since):
+                    return False
+                if until is not None and (created_at is None or created_at >= until):
+                    return False
+                return created_by is None or author == created_by
+
+            versions: List[Any] = []
+            archive_ids = (
+                self.db.query(EventVersionArchive.id)
+                .filter(EventVersionArchive.event_id == event_id, EventVersionArchive.last_version > after_version)
+                .order_by(EventVersionArchive.first_version.asc())
+                .all()
+            )
+            for (archive_id,) in archive_ids:
+                rows = _decode_archive(self.db.get(EventVersionArchive, archive_id))
+                for row in sorted(rows, key=lambda row: row["version_number"]):
+                    version = _archived_version(event_id, row)
+                    if version.version_number <= after_version or not matches(version.created_at, version.created_by):
+                        continue
+                    if not include_data:
+                        version.version_data = None
+                    versions.append(version)
+                if len(versions) >= limit:
+                    return versions[:limit]
+
+            columns = [
+                EventVersion.id, EventVersion.event_id, EventVersion.version_number, EventVersion.is_snapshot,
+                EventVersion.created_at, EventVersion.created_by, EventVersion.previous_version_id,
+            ]
+            query = (
+                self.db.query(EventVersion) if include_data else self.db.query(*columns)
+            ).filter(EventVersion.event_id == event_id, EventVersion.version_number > after_version)
+            if since is not None:
+                query = query.filter(EventVersion.created_at >= since)
+            if until is not None:
+                query = query.filter(EventVersion.created_at < until)
+            if created_by is not None:
+                query = query.filter(EventVersion.created_by == created_by)
+            versions.extend(query.order_by(EventVersion.version_number.asc()).limit(limit - len(versions)).all())
+            return versions
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch versions")
+
+    def materialize(self, event_id: int, version_number: int) -> Optional[Dict[str, Any]]:
+        """Full state of the event at ``version_number``: the nearest snapshot at or before it
+        with the following deltas applied, so at most EVENT_VERSION_SNAPSHOT_INTERVAL rows are read."""
+        try:
+            snapshot = (
+                self.db.query(EventVersion.version_number, EventVersion.version_data)
+                .filter(
+                    EventVersion.event_id == event_id,
+                    EventVersion.is_snapshot.is_(True),
+                    EventVersion.version_number <= version_number,
+                )
+                .order_by(EventVersion.version_number.desc())
+                .first()
+            )
+            if snapshot is not None:
+                state, applied_through = dict(snapshot.version_data), snapshot.version_number
+            else:
+                # The nearest snapshot has been moved to cold storage
+                chain = self._archived_chain(event_id, version_number)
+                if not chain:
+                    return None
+                state = dict(chain[0]["version_data"])
+                for row in chain[1:]:
+                    state.update(row["version_data"])
+                applied_through = chain[-1]["version_number"]
+            deltas = (
+                self.db.query(EventVersion.version_data)
+                .filter(
+                    EventVersion.event_id == event_id,
+                    EventVersion.version_number > applied_through,
+                    EventVersion.version_number <= version_number,
+                )
+                .order_by(EventVersion.version_number.asc())
+            )
+            for (delta,) in deltas:
+                state.update(delta)
+            return state
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to materialize version")
+
+    def compose_diff(self, event_id: int, from_version: int, to_version: int) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Diff between two versions composed from the per-version changelog diffs.
+
+        Only the small step diffs in between are read, never version payloads. Returns None
+        when some step has no recorded diff (history written before diffs were stored).
+        """
+        try:
+            if from_version == to_version:
+                return {}
+            low, high = sorted((from_version, to_version))
+            steps = (
+                self.db.query(Changelog.version_number, Changelog.changes)
+                .filter(
+                    Changelog.event_id == event_id,
+                    Changelog.version_number > low,
+                    Changelog.version_number <= high,
+                )
+                .order_by(Changelog.version_number.asc())
+                .all()
+            )
+            if len(steps) != high - low:
+                return None
+            diff = compose_changes([changes or {} for _, changes in steps])
+            if from_version > to_version:
+                diff = {field: {"from": change["to"], "to": change["from"]} for field, change in diff.items()}
+            return diff
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to compose diff")
+
+    def _archived_chain(self, event_id: int, version_number: int) -> List[dict]:
+        """Archived rows from the nearest archived snapshot up to ``version_number``, oldest first."""
+        ranges = (
+            self.db.query(EventVersionArchive.id)
+            .filter(EventVersionArchive.event_id == event_id, EventVersionArchive.first_version <= version_number)
+            .order_by(EventVersionArchive.first_version.desc())
+            .all()
+        )
+        chain: List[dict] = []
+        # Walk back one blob at a time so only the blobs needed are decompressed
+        for (archive_id,) in ranges:
+            rows = _decode_archive(self.db.get(EventVersionArchive, archive_id))
+            for row in sorted(rows, key=lambda row: row["version_number"], reverse=True):
+                if row["version_number"] > version_number:
+                    continue
+                chain.append(row)
+                if row["is_snapshot"]:
+                    return chain[::-1]
+        return []
+
+    def archive_event(self, event_id: int, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Move the event's versions that are past the age or count limit into compressed blobs.
+
+        The newest version always stays hot, and the first version left hot is rewritten as a
+        full snapshot so materializing hot versions never has to touch the archive.
+        """
+        now = now or datetime.utcnow()
+        hot = (
+            self.db.query(EventVersion.version_number, EventVersion.created_at)
+            .filter(EventVersion.event_id == event_id)
+            .order_by(EventVersion.version_number.asc())
+            .all()
+        )
+        moved = {"versions": 0, "raw_bytes": 0, "compressed_bytes": 0}
+        if len(hot) < 2:
+            return moved
+        latest = hot[-1].version_number
+        age_limit = now - timedelta(days=settings.EVENT_VERSION_ARCHIVE_AFTER_DAYS)
+        candidates = [
+            row.version_number for row in hot
+            if row.version_number <= latest - settings.EVENT_VERSION_ARCHIVE_KEEP_LATEST
+            or (row.created_at is not None and row.created_at < age_limit)
+        ]
+        if not candidates:
+            return moved
+        cutoff = min(max(candidates), latest - 1)
+
+        first_hot = (
+            self.db.query(EventVersion)
+            .filter(EventVersion.event_id == event_id, EventVersion.version_number > cutoff)
+            .order_by(EventVersion.version_number.asc())
+            .first()
+        )
+        if not first_hot.is_snapshot:
+            first_hot.version_data = self.materialize(event_id, first_hot.version_number)
+            first_hot.is_snapshot = True
+
+        cold = (
+            self.db.query(EventVersion)
+            .filter(EventVersion.event_id == event_id, EventVersion.version_number <= cutoff)
+            .order_by(EventVersion.version_number.asc())
+            .all()
+        )
+        per_blob = max(settings.EVENT_VERSION_ARCHIVE_VERSIONS_PER_BLOB, 1)
+        for offset in range(0, len(cold), per_blob):
+            batch = cold[offset:offset + per_blob]
+            raw = _encode_versions(batch)
+            payload = zlib.compress(raw, 9)
+            self.db.add(EventVersionArchive(
+                event_id=event_id,
+                first_version=batch[0].version_number,
+                last_version=batch[-1].version_number,
+                min_version_id=min(version.id for version in batch),
+                max_version_id=max(version.id for version in batch),
+                version_count=len(batch),
+                codec="zlib",
+                payload=payload,
+                raw_bytes=len(raw),
+                compressed_bytes=len(payload),
+            ))
+            moved["versions"] += len(batch)
+            moved["raw_bytes"] += len(raw)
+            moved["compressed_bytes"] += len(payload)
+        self.db.query(EventVersion).filter(
+            EventVersion.event_id == event_id, EventVersion.version_number <= cutoff
+        ).delete(synchronize_session=False)
+        for version in cold:
+            self.db.expunge(version)
+        return moved
+
+    def compact(self, max_events: int) -> Dict[str, int]:
+        """Archive cold versions for up to ``max_events`` events, committing per event."""
+        now = datetime.utcnow()
+        age_limit = now - timedelta(days=settings.EVENT_VERSION_ARCHIVE_AFTER_DAYS)
+        event_ids = [
+            event_id for (event_id,) in (
+                self.db.query(EventVersion.event_id)
+                .group_by(EventVersion.event_id)
+                .having(or_(
+                    func.count(EventVersion.id) > settings.EVENT_VERSION_ARCHIVE_KEEP_LATEST,
+                    and_(func.count(EventVersion.id) > 1, func.min(EventVersion.created_at) < age_limit),
+                ))
+                .limit(max_events)
+            )
+        ]
+        totals = {"events": 0, "versions": 0, "raw_bytes": 0, "compressed_bytes": 0}
+        for event_id in event_ids:
+            try:
+                moved = self.archive_event(event_id, now)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            if moved["versions"]:
+                totals["events"] += 1
+                for key, value in moved.items():
+                    totals[key] += value
+        return totals
+
+    def archive_stats(self) -> Dict[str, int]:
+        try:
+            blobs, versions, raw_bytes, compressed_bytes = self.db.query(
+                func.count(EventVersionArchive.id),
+                func.coalesce(func.sum(EventVersionArchive.version_count), 0),
+                func.coalesce(func.sum(EventVersionArchive.raw_bytes), 0),
+                func.coalesce(func.sum(EventVersionArchive.compressed_bytes), 0),
+            ).one()
+            return {
+                "blobs": blobs,
+                "versions": versions,
+                "raw_bytes": raw_bytes,
+                "compressed_bytes": compressed_bytes,
+                "reclaimed_bytes": raw_bytes - compressed_bytes,
+            }
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to read version archive stats")
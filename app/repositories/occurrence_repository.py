@@ -0,0 +1,150 @@
+from sqlalchemy import and_, delete, func, insert, literal
+from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.core.recurrence import iter_occurrences, parse_rrule
+from app.models.event import Event
+from app.models.event_occurrence import EventOccurrence
+from app.models.permission import Permission, RoleEnum
+from app.schemas.event import EventScope
+from fastapi import HTTPException, status
+
+INSERT_CHUNK_SIZE = 1000
+
+def occurrence_horizon() -> datetime:
+    return datetime.utcnow() + timedelta(days=settings.OCCURRENCE_HORIZON_DAYS)
+
+def occurrence_store_covers(window_end: datetime) -> bool:
+    """Whether stored occurrences are complete up to ``window_end``.
+
+    One day of slack is left for the refresh job, which runs every OCCURRENCE_REFRESH_SECONDS.
+    """
+    return settings.OCCURRENCE_STORE_ENABLED and window_end <= occurrence_horizon() - timedelta(days=1)
+
+class OccurrenceRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _insert(self, event_id: int, occurrences: Iterable[Tuple[datetime, datetime]]) -> int:
+        inserted = 0
+        chunk = []
+        for start_time, end_time in occurrences:
+            chunk.append({"event_id": event_id, "start_time": start_time, "end_time": end_time})
+            if len(chunk) >= INSERT_CHUNK_SIZE:
+                self.db.execute(insert(EventOccurrence), chunk)
+                inserted += len(chunk)
+                chunk = []
+        if chunk:
+            self.db.execute(insert(EventOccurrence), chunk)
+            inserted += len(chunk)
+        return inserted
+
+    def _series_occurrences(self, event: Event, after: Optional[datetime], horizon: datetime):
+        try:
+            rule = parse_rrule(event.recurrence_pattern)
+        except ValueError:
+            return
+        window_start = after or event.start_time
+        for start_time, end_time in iter_occurrences(event.start_time, event.end_time, rule, window_start, horizon):
+            if after is None or start_time > after:
+                yield start_time, end_time
+
+    def delete_for_event(self, event_id: int) -> None:
+        try:
+            self.db.execute(delete(EventOccurrence).where(EventOccurrence.event_id == event_id))
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete occurrences")
+
+    def materialize(self, event: Event, horizon: Optional[datetime] = None) -> int:
+        """Replace the stored occurrences of ``event`` (no-op rows for one-off events)."""
+        try:
+            self.delete_for_event(event.id)
+            if not event.is_recurring or not event.recurrence_pattern:
+                return 0
+            return self._insert(event.id, self._series_occurrences(event, None, horizon or occurrence_horizon()))
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to materialize occurrences")
+
+    def extend_all(self, horizon: Optional[datetime] = None, batch_size: int = 500) -> int:
+        """Append occurrences past each series' last stored one, up to ``horizon``."""
+        try:
+            horizon = horizon or occurrence_horizon()
+            last_stored = (
+                self.db.query(EventOccurrence.event_id, func.max(EventOccurrence.start_time).label("last_start"))
+                .group_by(EventOccurrence.event_id)
+                .subquery()
+            )
+            query = (
+                self.db.query(Event, last_stored.c.last_start)
+                .outerjoin(last_stored, last_stored.c.event_id == Event.id)
+                .filter(Event.is_recurring.is_(True), Event.recurrence_pattern.isnot(None), Event.start_time < horizon)
+                .order_by(Event.id)
+            )
+            inserted = 0
+            for event, last_start in query.yield_per(batch_size):
+                inserted += self._insert(event.id, self._series_occurrences(event, last_start, horizon))
+            self.db.commit()
+            return inserted
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to extend occurrences")
+
+    def find_overlapping(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_event_id: Optional[int] = None,
+    ) -> List[Tuple[int, str, datetime, datetime, RoleEnum]]:
+        try:
+            query = (
+                self.db.query(
+                    Event.id, Event.title, EventOccurrence.start_time, EventOccurrence.end_time, Permission.role
+                )
+                .join(Permission, and_(Permission.event_id == EventOccurrence.event_id, Permission.user_id == user_id))
+                .join(Event, Event.id == EventOccurrence.event_id)
+                .filter(EventOccurrence.start_time < end_time, EventOccurrence.end_time > start_time)
+            )
+            if exclude_event_id is not None:
+                query = query.filter(EventOccurrence.event_id != exclude_event_id)
+            return query.order_by(EventOccurrence.start_time.asc(), Event.id.asc()).all()
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch occurrences")
+
+    def list_for_window(
+        self,
+        user_id: int,
+        window_start: datetime,
+        window_end: datetime,
+        scope: EventScope = EventScope.owned,
+        limit: Optional[int] = None,
+    ) -> List[tuple]:
+        """Stored occurrences in the window as (event, start, end, role) rows, by start."""
+        try:
+            if scope == EventScope.owned:
+                query = (
+                    self.db.query(Event, EventOccurrence.start_time, EventOccurrence.end_time, literal(RoleEnum.owner.value))
+                    .join(Event, Event.id == EventOccurrence.event_id)
+                    .filter(Event.owner_id == user_id)
+                )
+            else:
+                query = (
+                    self.db.query(Event, EventOccurrence.start_time, EventOccurrence.end_time, Permission.role)
+                    .join(Permission, and_(Permission.event_id == EventOccurrence.event_id, Permission.user_id == user_id))
+                    .join(Event, Event.id == EventOccurrence.event_id)
+                )
+                if scope == EventScope.shared:
+                    query = query.filter(Permission.role != RoleEnum.owner)
+            query = query.filter(
+                EventOccurrence.start_time < window_end, EventOccurrence.end_time > window_start
+            ).order_by(EventOccurrence.start_time.asc(), Event.id.asc())
+            if limit is not None:
+                query = query.limit(limit)
+            return query.all()
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list occurrences")
@@ -1,8 +1,9 @@
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
+from typing import List, Tuple
 from app.models.user import User, TokenBlacklist
 from app.schemas.user import UserCreate
-from app.core.security import hash_password
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import HTTPException, status
 
 
@@ -22,32 +23,33 @@ class UserRepository:
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch user by username")
 
-    def create_user(self, user: UserCreate) -> User:
+    def create_user(self, user: UserCreate, hashed_password: str) -> User:
         try:
-            hashed_password = hash_password(user.password)
             db_user = User(username=user.username, email=user.email, hashed_password=hashed_password)
             self.db.add(db_user)
             self.db.commit()
             self.db.refresh(db_user)
             return db_user
+        except HTTPException:
+            raise
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create user")
 
-    def add_blacklisted_token(self, token: str, expires_at: datetime) -> None:
+    def add_blacklisted_token(self, token_hash: str, expires_at: datetime) -> None:
         try:
-            blacklist_entry = TokenBlacklist(token=token, expires_at=expires_at)
+            blacklist_entry = TokenBlacklist(token_hash=token_hash, expires_at=expires_at)
             self.db.add(blacklist_entry)
             self.db.commit()
         except Exception as e:
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to blacklist token")
 
-    def is_token_blacklisted(self, token: str) -> bool:
+    def is_token_blacklisted(self, token_hash: str) -> bool:
         try:
             return (
-                self.db.query(TokenBlacklist)
-                .filter(TokenBlacklist.token == token)
+                self.db.query(TokenBlacklist.id)
+                .filter(TokenBlacklist.token_hash == token_hash)
                 .first()
                 is not None
             )
@@ -56,3 +58,38 @@ class UserRepository:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to check token blacklist"
             )
+
+    def list_active_blacklisted_tokens(self) -> List[Tuple[str, datetime]]:
+        try:
+            return (
+                self.db.query(TokenBlacklist.token_hash, TokenBlacklist.expires_at)
+                .filter(TokenBlacklist.expires_at > datetime.now(timezone.utc))
+                .all()
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to load token blacklist"
+            )
+
+    def delete_expired_blacklisted_tokens(self, batch_size: int) -> int:
+        try:
+            expired_ids = (
+                select(TokenBlacklist.id)
+                .where(TokenBlacklist.expires_at <= datetime.now(timezone.utc))
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = self.db.execute(
+                delete(TokenBlacklist)
+                .where(TokenBlacklist.id.in_(expired_ids))
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to purge expired blacklisted tokens"
+            )
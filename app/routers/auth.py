@@ -3,16 +3,18 @@ from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 from app.schemas.user import UserCreate, UserOut, TokenResponse, UserResponse
 from app.services.auth_service import AuthService
-from app.db.base import get_db
-from app.core.security import create_access_token, create_refresh_token
+from app.db.base import get_db, run_db
+from app.core.security import create_access_token, create_refresh_token, hash_password, verify_password
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 @router.post("/register", response_model=UserResponse)
 async def register(user_in: UserCreate, db: Session = Depends(get_db)):
     try:
+        # Hashed before any DB work so the hash never holds a run_db slot or a connection
+        hashed_password = await hash_password(user_in.password)
         service = AuthService(db)
-        user = service.register_user(user_in)
+        user = await run_db(service.register_user, user_in, hashed_password)
 
         access_token = create_access_token({"sub": user.username})
         refresh_token = create_refresh_token({"sub": user.username})
@@ -25,6 +27,8 @@ async def register(user_in: UserCreate, db: Session = Depends(get_db)):
             access_token=access_token,
             refresh_token=refresh_token
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Registration failed: {str(e)}")
 
@@ -32,9 +36,9 @@ async def register(user_in: UserCreate, db: Session = Depends(get_db)):
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     try:
         service = AuthService(db)
-        user = service.login_user(form_data.username, form_data.password)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
+        user = await run_db(service.find_login_user, form_data.username)
+        if not user or not await verify_password(form_data.password, user.hashed_password):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
         
         tokens = service.create_tokens(user.id)
         return UserResponse(
@@ -68,7 +72,7 @@ async def logout(db: Session = Depends(get_db), authorization: str = Header(...)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Authorization header format")
 
         service = AuthService(db)
-        service.logout_user(access_token)
+        await run_db(service.logout_user, access_token)
         return {"message": "Logout successful"}
     except HTTPException:
         raise
@@ -1,45 +1,99 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.schemas.permission import PermissionCreate, PermissionUpdate, PermissionResponse
+from typing import List, Optional
+from app.schemas.permission import (
+    PermissionCreate, PermissionUpdate, PermissionResponse, PermissionBulkCreate, PermissionBulkUserCreate,
+    BulkShareItemOut, PermissionPage, PermissionCounts
+)
 from app.services.collaboration_service import CollaborationService
-from app.db.base import get_db
+from app.db.base import get_db, run_db
+from app.core.deps import get_current_user
+from app.core.permission import EventAccess, require_event_role
+from app.core.token_cache import CachedUser
+from app.models.permission import RoleEnum
 
 router = APIRouter(prefix="/api/events", tags=["Collaboration"])
 
 @router.post("/{event_id}/share", response_model=PermissionResponse)
-async def share_event(event_id: int, payload: PermissionCreate, db: Session = Depends(get_db)):
+async def share_event(event_id: int, payload: PermissionCreate, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.owner))):
     try:
         service = CollaborationService(db)
-        return service.share_event(event_id, payload.user_id, payload.role)
+        return await run_db(service.share_event, event_id, payload.user_id, payload.role)
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to share event")
 
-@router.get("/{event_id}/permissions", response_model=List[PermissionResponse])
-async def list_permissions(event_id: int, db: Session = Depends(get_db)):
+@router.post("/share/bulk", response_model=List[BulkShareItemOut])
+async def bulk_share_user(payload: PermissionBulkUserCreate, db: Session = Depends(get_db),
+user: CachedUser = Depends(get_current_user)):
     try:
         service = CollaborationService(db)
-        return service.list_permission(event_id)
+        return await run_db(service.bulk_share_user, payload.user_id, payload.role, payload.event_ids, user.id)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to share events")
+
+@router.post("/{event_id}/share/bulk", response_model=List[BulkShareItemOut])
+async def bulk_share_event(event_id: int, payload: PermissionBulkCreate, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.owner))):
+    try:
+        service = CollaborationService(db)
+        shares = [(share.user_id, share.role) for share in payload.shares]
+        return await run_db(service.bulk_share_event, event_id, shares)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to share event")
+
+@router.get("/{event_id}/permissions", response_model=PermissionPage)
+async def list_permissions(
+    event_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    role: Optional[RoleEnum] = None,
+    db: Session = Depends(get_db),
+    access: EventAccess = Depends(require_event_role(RoleEnum.viewer)),
+):
+    try:
+        service = CollaborationService(db)
+        permissions, next_cursor = await run_db(service.list_permission, event_id, limit, cursor, role)
+        return {"items": permissions, "next_cursor": next_cursor}
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch permissions")
 
+@router.get("/{event_id}/permissions/counts", response_model=PermissionCounts)
+async def permission_counts(event_id: int, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.viewer))):
+    try:
+        service = CollaborationService(db)
+        return await run_db(service.permission_counts, event_id)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to count permissions")
+
 @router.put("/{event_id}/permissions/{user_id}", response_model=PermissionResponse)
-async def update_permission(event_id: int, user_id: int, payload: PermissionUpdate, db: Session = Depends(get_db)):
+async def update_permission(event_id: int, user_id: int, payload: PermissionUpdate, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.owner))):
     try:
         service = CollaborationService(db)
-        return service.update_permission(event_id, user_id, payload.role)
+        return await run_db(service.update_permission, event_id, user_id, payload.role)
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update permission")
 
 @router.delete("/{event_id}/permissions/{user_id}")
-async def remove_permission(event_id: int, user_id: int, db: Session = Depends(get_db)):
+async def remove_permission(event_id: int, user_id: int, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.owner))):
     try:
         service = CollaborationService(db)
-        service.remove_permission(event_id, user_id)
+        await run_db(service.remove_permission, event_id, user_id)
         return {"message": "Permission removed successfully"}
     except HTTPException as e:
         raise e
@@ -1,70 +1,227 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.schemas.event import EventBase, EventUpdate, EventOut, EventCreateBatch
+from app.schemas.event import (
+    EventBase, EventUpdate, EventOut, EventCreateBatch, EventPage, EventScope, EVENT_HISTORY_FIELDS,
+    ConflictMode, EventConflictOut, EventOccurrenceOut, EventBatchItemOut, EventImportResult, ImportFormat,
+    ExportFormat
+)
 from app.services.event_service import EventService
+from app.services.event_import_service import EventImportService
+from app.services.event_export_service import EventExportService
 from app.schemas.user import UserOut
-from app.db.base import get_db
+from app.db.base import SessionLocal, get_db, run_db, run_db_in_thread
 from app.core.deps import get_current_user
-from typing import List
+from app.core.config import settings
+from app.core.etag import event_etag, if_none_match_matches
+from app.core.permission import EventAccess, require_event_role
+from app.models.permission import RoleEnum
+from typing import List, Optional, Tuple
+from app.core.datetimes import UTCDateTime
+from anyio import from_thread
 
 router = APIRouter(prefix="/api/events", tags=["Events"])
 
+def _parse_include(include: Optional[str], default: Tuple[str, ...]) -> Tuple[str, ...]:
+    if include is None:
+        return default
+    fields = tuple(field.strip() for field in include.split(",") if field.strip())
+    unknown = set(fields) - set(EVENT_HISTORY_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported include value(s): {', '.join(sorted(unknown))}"
+        )
+    return fields
+
+def _conflict_mode(mode: Optional[ConflictMode]) -> ConflictMode:
+    return mode or ConflictMode(settings.EVENT_CONFLICT_MODE)
+
 @router.post("/", response_model=EventOut, status_code=status.HTTP_201_CREATED)
 async def create_event(
     payload: EventBase,
+    response: Response,
+    include: Optional[str] = None,
+    conflict_mode: Optional[ConflictMode] = None,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
     try:
+        fields = _parse_include(include, EVENT_HISTORY_FIELDS)
         service = EventService(db)
-        event = service.create_event(user.id, payload)
-        event_with_versions = service.get_event_with_versions(event.id)
-        return event_with_versions
+        event = await run_db(service.create_event, user.id, payload, fields, _conflict_mode(conflict_mode))
+        response.headers["ETag"] = event_etag(event.id, event.current_version)
+        return event
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create event"
         )
-@router.get("/", response_model=List[EventOut])
-async def list_events(db: Session = Depends(get_db), user= Depends(get_current_user)):
+@router.get("/", response_model=EventPage)
+async def list_events(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    window_start: Optional[UTCDateTime] = None,
+    window_end: Optional[UTCDateTime] = None,
+    is_recurring: Optional[bool] = None,
+    location: Optional[str] = None,
+    scope: EventScope = EventScope.owned,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db),
+    user= Depends(get_current_user),
+):
     try:
+        fields = _parse_include(include, ())
         service = EventService(db)
-        return service.list_events(user.id)
+        events, next_cursor = await run_db(
+            service.list_events, user.id, limit, cursor=cursor, window_start=window_start,
+            window_end=window_end, is_recurring=is_recurring, location=location, scope=scope,
+            include=fields
+        )
+        return {"items": events, "next_cursor": next_cursor}
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list events")
     
+@router.get("/occurrences", response_model=List[EventOccurrenceOut])
+async def list_occurrences(
+    window_start: UTCDateTime,
+    window_end: UTCDateTime,
+    scope: EventScope = EventScope.owned,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    try:
+        service = EventService(db)
+        return await run_db(service.list_occurrences, user.id, window_start, window_end, scope, limit)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to list occurrences")
+
+@router.get("/conflicts", response_model=List[EventConflictOut])
+async def find_conflicts(
+    start_time: UTCDateTime,
+    end_time: UTCDateTime,
+    exclude_event_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    try:
+        service = EventService(db)
+        return await run_db(service.find_conflicts, user.id, start_time, end_time, exclude_event_id, limit)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to check conflicts")
+
+EXPORT_MEDIA_TYPES = {ExportFormat.ics: "text/calendar", ExportFormat.ndjson: "application/x-ndjson"}
+
+@router.get("/export")
+async def export_events(
+    format: ExportFormat = ExportFormat.ics,
+    scope: EventScope = EventScope.accessible,
+    expand: bool = False,
+    window_start: Optional[UTCDateTime] = None,
+    window_end: Optional[UTCDateTime] = None,
+    user: UserOut = Depends(get_current_user),
+):
+    if (window_start is None) != (window_end is None):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="window_start and window_end must be given together")
+    if expand and window_start is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="expand requires window_start and window_end")
+    if window_start is not None and window_end <= window_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="window_end must be after window_start")
+    # The body is produced after this handler returns, so the export gets its own session
+    service = EventExportService(SessionLocal())
+    return StreamingResponse(
+        service.export(user.id, format, scope, expand, window_start, window_end),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="events.{format.value}"'},
+    )
+
 @router.get("/{event_id}", response_model=EventOut)
-async def get_event(event_id: int, db: Session = Depends(get_db), user: int = Depends(get_current_user)):
+async def get_event(event_id: int, response: Response, include: Optional[str] = None, if_none_match: Optional[str] = Header(None),
+db: Session = Depends(get_db), access: EventAccess = Depends(require_event_role(RoleEnum.viewer, with_event=True))):
     try:
+        fields = _parse_include(include, EVENT_HISTORY_FIELDS)
         service = EventService(db)
-        return service.get_event(event_id, user.id)
+        if if_none_match is not None:
+            etag = event_etag(access.event.id, access.event.current_version)
+            if if_none_match_matches(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        event = await run_db(service.get_event, access, fields)
+        response.headers["ETag"] = event_etag(event.id, event.current_version)
+        return event
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch event")
 
 @router.put("/{event_id}", response_model=EventOut)
-async def update_event(event_id: int, payload: EventUpdate, db: Session = Depends(get_db), user: int = Depends(get_current_user)):
+async def update_event(event_id: int, payload: EventUpdate, response: Response, include: Optional[str] = None, conflict_mode: Optional[ConflictMode] = None,
+if_match: Optional[str] = Header(None), db: Session = Depends(get_db), access: EventAccess = Depends(require_event_role(RoleEnum.editor, with_event=True))):
     try:
+        fields = _parse_include(include, EVENT_HISTORY_FIELDS)
         service = EventService(db)
-        return service.update_event(event_id, payload, user.id)
+        event = await run_db(
+            service.update_event, access, payload, fields, _conflict_mode(conflict_mode), if_match
+        )
+        response.headers["ETag"] = event_etag(event.id, event.current_version)
+        return event
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update events") 
 
-@router.post("/batch", response_model=List[EventOut], status_code=status.HTTP_201_CREATED)
-async def create_batch_events( data: EventCreateBatch,db: Session = Depends(get_db),
-current_user: UserOut = Depends(get_current_user)):
+@router.post("/batch", response_model=List[EventBatchItemOut], status_code=status.HTTP_201_CREATED)
+async def create_batch_events( data: EventCreateBatch, include: Optional[str] = None, conflict_mode: Optional[ConflictMode] = None,
+db: Session = Depends(get_db), current_user: UserOut = Depends(get_current_user)):
     try:
+        fields = _parse_include(include, ())
         service = EventService(db)
-        return service.create_batch(data, current_user.id)
+        return await run_db(service.create_batch, data, current_user.id, fields, _conflict_mode(conflict_mode))
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create batch") 
     
 
+def _read_body(request: Request):
+    """Yield request body chunks to a worker thread as they arrive."""
+    stream = request.stream().__aiter__()
+    while True:
+        try:
+            yield from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+
+@router.post("/import", response_model=EventImportResult, status_code=status.HTTP_201_CREATED)
+async def import_events(request: Request, format: Optional[ImportFormat] = None,
+db: Session = Depends(get_db), current_user: UserOut = Depends(get_current_user)):
+    try:
+        if format is None:
+            content_type = request.headers.get("content-type", "")
+            format = ImportFormat.csv if "csv" in content_type else ImportFormat.ndjson
+        service = EventImportService(db)
+        return await run_db_in_thread(service.import_events, current_user.id, _read_body(request), format)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to import events")
+
 @router.delete("/{event_id}")
-async def delete_event(event_id: int, db: Session = Depends(get_db)):
+async def delete_event(event_id: int, if_match: Optional[str] = Header(None), db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.owner))):
     try:
         service = EventService(db)
-        return service.delete_event(event_id)
+        return await run_db(service.delete_event, event_id, if_match)
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete events") 
\ No newline at end of file
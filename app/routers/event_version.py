@@ -1,27 +1,45 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Header, Query, Response, status, HTTPException
 from sqlalchemy.orm import Session
-from app.db.base import get_db
+from app.db.base import get_db, run_db
+from app.core.etag import event_etag
+from app.core.permission import EventAccess, require_event_role
+from app.models.permission import RoleEnum
 from app.schemas.event_version import EventVersionOut, ChangelogOut, DiffOut
 from app.services.event_version_service import EventVersionService
-from typing import Any
+from typing import Any, Dict, Optional
+from app.core.datetimes import UTCDateTime
 from app.schemas.event import EventOut
 
 
 router = APIRouter(prefix="/api/events", tags=["Event Version"])
 
-@router.get("/{id}/history/{versionId}", response_model=EventVersionOut)
-async def get_version(id: int, version_id: int, db: Session = Depends(get_db)):
+@router.get("/{id}/history/{version_id}", response_model=EventVersionOut)
+async def get_version(id: int, version_id: int, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.viewer, path_param="id"))):
     try:
-        return EventVersionService(db).get_version_by_id(id, version_id)
+        return await run_db(EventVersionService(db).get_version_by_id, id, version_id)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code= status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Unexpected error: {str(e)}")
+
+@router.get("/{event_id}/history/{version_id}/state", response_model=Dict[str, Any])
+async def get_version_state(event_id: int, version_id: int, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.viewer))):
+    try:
+        return await run_db(EventVersionService(db).get_version_state, event_id, version_id)
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code= status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Unexpected error: {str(e)}")
 
 @router.post("/{id}/rollback/{versionId}", response_model=EventOut, status_code=status.HTTP_200_OK)
-async def rollback_version(id: int, versionId: int, db: Session = Depends(get_db)):
+async def rollback_version(id: int, versionId: int, response: Response, if_match: Optional[str] = Header(None), db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.editor, path_param="id"))):
     try:
-        return EventVersionService(db).rollback_to_version(id, versionId)
+        event = await run_db(EventVersionService(db).rollback_to_version, id, versionId, if_match, access.user.id)
+        response.headers["ETag"] = event_etag(event.id, event.current_version)
+        return event
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -32,22 +50,36 @@ async def rollback_version(id: int, versionId: int, db: Session = Depends(get_db
     
 
 @router.get("/{event_id}/changelog", response_model=ChangelogOut)
-async def get_changelog(event_id: int, db: Session = Depends(get_db)):
+async def get_changelog(
+    event_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    since: Optional[UTCDateTime] = None,
+    until: Optional[UTCDateTime] = None,
+    created_by: Optional[int] = None,
+    include_data: bool = True,
+    db: Session = Depends(get_db),
+    access: EventAccess = Depends(require_event_role(RoleEnum.viewer)),
+):
     try:
         service = EventVersionService(db)
-        versions = service.get_changgelog(event_id)
-        if not versions:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event or versions not found")
-        return {"versions": versions}
+        versions, next_cursor = await run_db(
+            service.get_changgelog, event_id, limit, cursor=cursor, since=since, until=until,
+            created_by=created_by, include_data=include_data
+        )
+        return {"versions": versions, "next_cursor": next_cursor}
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Unexpected error: {str(e)}")
     
 
 @router.get("/{event_id}/diff/{v1_id}/{v2_id}", response_model=DiffOut)
-async def get_diff(event_id: int, v1_id: int, v2_id: int, db: Session = Depends(get_db)):
+async def get_diff(event_id: int, v1_id: int, v2_id: int, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.viewer))):
     service = EventVersionService(db)
     try:
-        differences = service.get_diff(event_id, v1_id, v2_id)
+        differences = await run_db(service.get_diff, event_id, v1_id, v2_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     return {"differences": differences}
\ No newline at end of file
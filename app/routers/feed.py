@@ -0,0 +1,64 @@
+import json
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.change_feed import ChangeMessage, Subscription, change_feed, event_topic, user_topic
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.core.permission import EventAccess, require_event_role
+from app.core.token_cache import CachedUser
+from app.db.base import get_db
+from app.models.permission import RoleEnum
+
+router = APIRouter(prefix="/api/events", tags=["Change Feed"])
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def _sse_message(message: ChangeMessage) -> str:
+    return f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+
+def _ends_event_feed(message: ChangeMessage, event_id: int, user_id: int) -> bool:
+    """The event is gone, or the subscriber no longer has access to it."""
+    if message.get("event_id") != event_id:
+        return False
+    if message["type"] == "deleted":
+        return True
+    return message["type"] == "permission" and message["user_id"] == user_id and message["role"] is None
+
+async def _stream(
+    request: Request, subscription: Subscription, user_id: int, event_id: Optional[int] = None
+) -> AsyncIterator[str]:
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            messages = await subscription.next_batch(settings.CHANGE_FEED_KEEPALIVE_SECONDS)
+            if await request.is_disconnected():
+                return
+            if not messages:
+                yield ": keepalive\n\n"
+                continue
+            for message in messages:
+                yield _sse_message(message)
+                if event_id is not None and _ends_event_feed(message, event_id, user_id):
+                    return
+    finally:
+        change_feed.unsubscribe(subscription)
+
+@router.get("/feed")
+async def user_feed(request: Request, db: Session = Depends(get_db), user: CachedUser = Depends(get_current_user)):
+    """Server-sent events about the caller's own access: shares, role changes and removals."""
+    db.close()
+    subscription = change_feed.subscribe([user_topic(user.id)])
+    return StreamingResponse(_stream(request, subscription, user.id), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/{event_id}/feed")
+async def event_feed(request: Request, event_id: int, db: Session = Depends(get_db),
+access: EventAccess = Depends(require_event_role(RoleEnum.viewer))):
+    """Server-sent events for one event: new versions, permission changes and deletion."""
+    # The stream can stay open for hours; do not keep the authorization query's connection
+    db.close()
+    subscription = change_feed.subscribe([event_topic(event_id)])
+    return StreamingResponse(
+        _stream(request, subscription, access.user.id, event_id), media_type="text/event-stream", headers=SSE_HEADERS
+    )
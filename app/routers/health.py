@@ -0,0 +1,54 @@
+import time
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from app.core.change_feed import change_feed
+from app.core.diff_cache import diff_cache
+from app.core.permission_cache import permission_cache
+from app.core.recurrence import occurrence_cache
+from app.core.token_cache import token_cache
+from app.core.version_archiver import version_archive_stats
+from app.db.base import engine, pool_stats, run_db
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+def _ping_db() -> float:
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+@router.get("/db")
+async def db_health():
+    try:
+        latency_ms = await run_db(_ping_db)
+    except Exception as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "detail": str(e), "pool": pool_stats()},
+        )
+    return {"status": "ok", "latency_ms": round(latency_ms, 2), "pool": pool_stats()}
+
+@router.get("/token-cache")
+async def token_cache_stats():
+    return token_cache.stats()
+
+@router.get("/recurrence-cache")
+async def recurrence_cache_stats():
+    return occurrence_cache.stats()
+
+@router.get("/permission-cache")
+async def permission_cache_stats():
+    return permission_cache.stats()
+
+@router.get("/change-feed")
+async def change_feed_stats():
+    return change_feed.stats()
+
+@router.get("/diff-cache")
+async def diff_cache_stats():
+    return diff_cache.stats()
+
+@router.get("/version-archive")
+async def version_archive():
+    return await run_db(version_archive_stats)
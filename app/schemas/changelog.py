@@ -1,12 +1,13 @@
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Any, Optional, Dict
 from datetime import datetime
 
 class ChangelogOut(BaseModel):
     id: int
     event_id: int
     version_id: Optional[int]
-    changes: Optional[Dict[str, Dict[str, str]]]
+    version_number: Optional[int] = None
+    changes: Optional[Dict[str, Dict[str, Any]]]
     description: Optional[str]
     created_at: datetime
     created_by: Optional[int]
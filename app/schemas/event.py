@@ -1,8 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator, model_validator
 from typing import Optional, List
 from datetime import datetime
 from app.schemas.changelog import ChangelogOut
 from pydantic import Field
+from enum import Enum
+from app.schemas.permission import RoleEnum
+from app.core.datetimes import to_naive_utc
+from app.core.recurrence import parse_rrule
+
+EVENT_HISTORY_FIELDS = ("versions", "changelogs")
+
+class EventScope(str, Enum):
+    owned = "owned"
+    accessible = "accessible"
+    shared = "shared"
+
+class ImportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+class ExportFormat(str, Enum):
+    ics = "ics"
+    ndjson = "ndjson"
+
+class ConflictMode(str, Enum):
+    ignore = "ignore"
+    warn = "warn"
+    reject = "reject"
 
 class EventBase(BaseModel):
     title: str
@@ -12,6 +36,25 @@ class EventBase(BaseModel):
     location: Optional[str] = None
     is_recurring: Optional[bool] = False
     recurrence_pattern: Optional[str] = None 
+
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def normalize_time(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
+
+    @field_validator("recurrence_pattern")
+    @classmethod
+    def validate_recurrence_pattern(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            parse_rrule(value)
+        return value
+
+    @model_validator(mode="after")
+    def validate_time_range(self):
+        # A reversed range is also rejected by the ix_events_time_range index on Postgres
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
     
 class EventCreate(EventBase):
     pass
@@ -25,6 +68,25 @@ class EventUpdate(BaseModel):
     is_recurring: Optional[bool] = None
     recurrence_pattern: Optional[str] = None
 
+    @field_validator("start_time", "end_time")
+    @classmethod
+    def normalize_time(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return to_naive_utc(value)
+
+    @field_validator("recurrence_pattern")
+    @classmethod
+    def validate_recurrence_pattern(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            parse_rrule(value)
+        return value
+
+    @model_validator(mode="after")
+    def validate_time_range(self):
+        # A one-sided change is checked against the stored end in EventService.update_event
+        if self.start_time and self.end_time and self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
 class EventVersionOut(BaseModel):
     version_number: int
     version_data: dict
@@ -38,6 +100,61 @@ class EventOut(EventBase):
     changelogs: List[ChangelogOut] = []
     created_at: datetime
     updated_at: datetime
+    role: Optional[RoleEnum] = None
+    conflicts: Optional[List[int]] = None
+
+    @field_validator("recurrence_pattern")
+    @classmethod
+    def validate_recurrence_pattern(cls, value: Optional[str]) -> Optional[str]:
+        # Stored patterns are returned as-is, including legacy ones that predate validation
+        return value
+
+    def validate_time_range(self):
+        # Stored rows are returned as-is, including any zero-length ones written before the check
+        return self
+
+class EventConflictOut(BaseModel):
+    id: int
+    title: str
+    start_time: datetime
+    end_time: datetime
+    role: RoleEnum
+
+class EventOccurrenceOut(BaseModel):
+    event_id: int
+    title: str
+    start_time: datetime
+    end_time: datetime
+    location: Optional[str] = None
+    is_recurring: bool = False
+    role: Optional[RoleEnum] = None
+
+class EventPage(BaseModel):
+    items: List[EventOut]
+    next_cursor: Optional[str] = None
+
+class EventBatchItemOut(BaseModel):
+    index: int
+    status: str  # "created" or "failed"
+    event: Optional[EventOut] = None
+    error: Optional[str] = None
+
+class EventImportError(BaseModel):
+    line: Optional[int] = None  # None when the whole chunk failed to load
+    error: str
+
+class EventImportChunkOut(BaseModel):
+    chunk: int
+    rows: int
+    imported: int
+    failed: int
+    errors: List[EventImportError] = []
+
+class EventImportResult(BaseModel):
+    rows: int
+    imported: int
+    failed: int
+    chunks: List[EventImportChunkOut]
 
 class EventCreateBatch(BaseModel):
     events: List[EventBase]
@@ -1,12 +1,13 @@
 from pydantic import BaseModel
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 from datetime import datetime
 
 class EventVersionOut(BaseModel):
     id: int
     event_id: int
     version_number: int
-    version_data: dict[str, Any]
+    version_data: Optional[dict[str, Any]] = None  # omitted when listed with include_data=false
+    is_snapshot: bool = True
     created_at: datetime
     created_by: int
     previous_version_id: int | None
@@ -16,6 +17,7 @@ class EventVersionOut(BaseModel):
 
 class ChangelogOut(BaseModel):
     versions: List[EventVersionOut]
+    next_cursor: Optional[str] = None
 
 class DiffOut(BaseModel):
     differences: Dict[str, Dict[str, Any]]
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from enum import Enum
+from typing import List, Optional
 
 class RoleEnum(str, Enum):
     owner = "owner"
@@ -22,3 +23,37 @@ class PermissionResponse(PermissionBase):
 
     class Config:
         from_attributes = True
+
+class PermissionPage(BaseModel):
+    items: List[PermissionResponse]
+    next_cursor: Optional[str] = None
+
+class PermissionCounts(BaseModel):
+    owner: int = 0
+    editor: int = 0
+    viewer: int = 0
+    total: int = 0
+
+class PermissionBulkCreate(BaseModel):
+    """Many users on one event."""
+    shares: List[PermissionCreate]
+
+class PermissionBulkUserCreate(BaseModel):
+    """One user on many events."""
+    user_id: int
+    role: RoleEnum
+    event_ids: List[int]
+
+class BulkShareStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    unchanged = "unchanged"
+    failed = "failed"
+
+class BulkShareItemOut(BaseModel):
+    index: int
+    event_id: int
+    user_id: int
+    role: RoleEnum
+    status: BulkShareStatus
+    error: Optional[str] = None
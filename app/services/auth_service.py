@@ -3,9 +3,12 @@ from fastapi import HTTPException, status
 from app.repositories.user_respository import UserRepository
 from app.schemas.user import UserCreate
 from app.core.security import (
-    hash_password, verify_password, create_access_token, 
-    create_refresh_token, verify_token, get_token_expiration
+    create_access_token, create_refresh_token, verify_token, get_token_expiration
 )
+from app.models.user import User
+from typing import Optional
+from app.core.token_cache import token_cache, token_digest
+from app.core.token_blacklist import token_blacklist, revoke_token
 from jose import JWTError
 
 class AuthService:
@@ -13,7 +16,7 @@ class AuthService:
         self.db = db
         self.user_repository = UserRepository(db)
 
-    def register_user(self, user_data: UserCreate):
+    def register_user(self, user_data: UserCreate, hashed_password: str):
         try:
             existing = (
                 self.user_repository.get_user_by_username(user_data.username)
@@ -25,32 +28,36 @@ class AuthService:
                     detail="Username or email already registered"
                 )
 
-            hashed_password = hash_password(user_data.password)
-            user = self.user_repository.create_user(user_data)
+            user = self.user_repository.create_user(user_data, hashed_password)
             return user
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"User registration failed: {str(e)}"
             )
 
-    def login_user(self, username_or_email: str, password: str):
+    def find_login_user(self, username_or_email: str) -> Optional[User]:
+        """Account for a login attempt, or None.
+
+        The session is closed before returning: the password check that follows runs on the
+        hashing pool and must not keep a pooled connection checked out meanwhile.
+        """
         try:
-            user = (
+            return (
                 self.user_repository.get_user_by_email(username_or_email)
                 or self.user_repository.get_user_by_username(username_or_email)
             )
-            if not user or not verify_password(password, user.hashed_password):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid credentials"
-                )
-            return user
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Login failed: {str(e)}"
             )
+        finally:
+            self.db.close()
 
     def create_tokens(self, user_id: int):
         try:
@@ -100,15 +107,21 @@ class AuthService:
                     detail="Invalid token"
                 )
 
-            if self.user_repository.is_token_blacklisted(access_token):
+            if (
+                token_blacklist.is_revoked(access_token)
+                or self.user_repository.is_token_blacklisted(token_digest(access_token))
+            ):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Token already logged out"
                 )
 
             expires_at = get_token_expiration(access_token)
-            self.user_repository.add_blacklisted_token(access_token, expires_at)
+            revoke_token(self.user_repository, access_token, expires_at)
+            token_cache.invalidate(access_token)
 
+        except HTTPException:
+            raise
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
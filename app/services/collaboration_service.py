@@ -1,6 +1,9 @@
 from fastapi import HTTPException, status
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.permission_cache import invalidate_permission
 from app.repositories.collaboration_repository import CollaborationRepository
 from app.models.permission import RoleEnum, Permission
 
@@ -19,6 +22,7 @@ class CollaborationService:
 
             permission = self.repo.create_role(event_id, user_id, role)
             self.db.commit()
+            invalidate_permission(event_id, user_id)
             return permission
         except HTTPException:
             raise 
@@ -29,17 +33,133 @@ class CollaborationService:
                 detail=f"Failed to share event with user: {str(e)}"
             )
 
-    def list_permission(self, event_id: int) -> List[Permission]:
+    def bulk_share_event(self, event_id: int, shares: List[Tuple[int, RoleEnum]]) -> List[dict]:
+        """Share one event with many ``(user_id, role)`` pairs; the caller is already known to own it."""
+        entries = [(event_id, user_id, role) for user_id, role in shares]
+        return self._bulk_share(entries, owned_event_ids={event_id})
+
+    def bulk_share_user(self, user_id: int, role: RoleEnum, event_ids: List[int], requester_id: int) -> List[dict]:
+        """Share many events with one user; events the requester does not own are rejected per entry."""
+        owned = self.repo.get_roles({(event_id, requester_id) for event_id in event_ids})
+        owned_event_ids = {event_id for (event_id, _), owned_role in owned.items() if owned_role == RoleEnum.owner}
+        return self._bulk_share([(event_id, user_id, role) for event_id in event_ids], owned_event_ids)
+
+    def _bulk_share(self, entries: List[Tuple[int, int, RoleEnum]], owned_event_ids: set) -> List[dict]:
+        """Upsert the valid entries in one transaction and report an outcome for every entry.
+
+        Entries for unknown users, events the requester does not own, repeated pairs and
+        existing owner permissions fail on their own; the rest are written with a single
+        INSERT ... ON CONFLICT, so the request never stops half-applied.
+        """
+        if len(entries) > settings.PERMISSION_BULK_MAX_ENTRIES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.PERMISSION_BULK_MAX_ENTRIES} entries per request"
+            )
+        try:
+            users = self.repo.existing_user_ids({user_id for _, user_id, _ in entries})
+            current = self.repo.get_roles({(event_id, user_id) for event_id, user_id, _ in entries})
+
+            items, writes, seen = [], [], set()
+            for index, (event_id, user_id, role) in enumerate(entries):
+                item = {"index": index, "event_id": event_id, "user_id": user_id, "role": role, "error": None}
+                items.append(item)
+                existing = current.get((event_id, user_id))
+                error: Optional[str] = None
+                if event_id not in owned_event_ids:
+                    error = "Event not found or permission denied"
+                elif user_id not in users:
+                    error = "User not found"
+                elif (event_id, user_id) in seen:
+                    error = "Duplicate entry"
+                elif existing == RoleEnum.owner:
+                    error = "Cannot change the owner's role"
+                seen.add((event_id, user_id))
+                if error:
+                    item.update(status="failed", error=error)
+                elif existing is None:
+                    item["status"] = "created"
+                elif existing == role:
+                    item["status"] = "unchanged"
+                else:
+                    item["status"] = "updated"
+                if item["status"] in ("created", "updated"):
+                    writes.append((event_id, user_id, role))
+
+            self.repo.upsert_roles(writes)
+            self.db.commit()
+            for event_id, user_id, _ in writes:
+                invalidate_permission(event_id, user_id)
+            return items
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to share events in bulk: {str(e)}"
+            )
+
+    def list_permission(
+        self,
+        event_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        role: Optional[RoleEnum] = None,
+    ) -> Tuple[List[Permission], Optional[str]]:
         try:
-            return self.repo.list_by_event(event_id)
+            after_id = None
+            if cursor:
+                values = decode_cursor(cursor)
+                try:
+                    after_id = int(values["id"])
+                except (KeyError, TypeError, ValueError):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid pagination cursor"
+                    )
+            permissions = self.repo.list_by_event(event_id, limit + 1, after_id, role)
+            next_cursor = None
+            if len(permissions) > limit:
+                permissions = permissions[:limit]
+                next_cursor = encode_cursor({"id": permissions[-1].id})
+            return permissions, next_cursor
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to list permissions: {str(e)}"
             )
 
+    def permission_counts(self, event_id: int) -> Dict[str, int]:
+        try:
+            counts = {role.value: 0 for role in RoleEnum}
+            counts.update((role.value, count) for role, count in self.repo.count_by_role(event_id).items())
+            counts["total"] = sum(counts.values())
+            return counts
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to count permissions: {str(e)}"
+            )
+
+    def _check_not_owner(self, event_id: int, user_id: int, detail: str) -> None:
+        """404 without a permission row and 409 for the owner's, which would lock the owner out."""
+        existing = self.repo.get_by_event_and_user(event_id, user_id)
+        if not existing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Permission not found for this user and event"
+            )
+        if existing.role == RoleEnum.owner:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
     def update_permission(self, event_id: int, user_id: int, role: RoleEnum) -> Permission:
         try:
+            self._check_not_owner(event_id, user_id, "Cannot change the owner's role")
             share = self.repo.update_role(event_id, user_id, role)
             if not share:
                 raise HTTPException(
@@ -47,6 +167,7 @@ class CollaborationService:
                     detail="Permission not found for this user and event"
                 )
             self.db.commit()
+            invalidate_permission(event_id, user_id)
             return share
         except HTTPException:
             raise
@@ -59,6 +180,7 @@ class CollaborationService:
 
     def remove_permission(self, event_id: int, user_id: int):
         try:
+            self._check_not_owner(event_id, user_id, "Cannot remove the owner's permission")
             success = self.repo.delete_permission(event_id, user_id)
             if not success:
                 raise HTTPException(
@@ -66,6 +188,7 @@ class CollaborationService:
                     detail="Permission not found for this user and event"
                 )
             self.db.commit()
+            invalidate_permission(event_id, user_id)
         except HTTPException:
             raise
         except Exception as e:
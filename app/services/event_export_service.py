@@ -0,0 +1,144 @@
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.recurrence import WEEKDAYS, Occurrence, expand_pattern, parse_rrule
+from app.repositories.event_repository import EventRepository
+from app.schemas.event import EventScope, ExportFormat
+from app.models.permission import RoleEnum
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+ICS_DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+def _ics_escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+def _ics_line(name: str, value: str) -> str:
+    """Content line folded at 75 octets as required by RFC 5545."""
+    line = f"{name}:{value}"
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+    parts, current, size = [], "", 0
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        # Continuation lines start with a space, which counts towards their 75 octets
+        if size + char_size > (75 if not parts else 74):
+            parts.append(current)
+            current, size = "", 0
+        current += char
+        size += char_size
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+def _ics_time(value: datetime) -> str:
+    # Stored times are naive UTC
+    return value.strftime(ICS_DATETIME_FORMAT)
+
+def _ics_rrule(pattern: str) -> Optional[str]:
+    """Canonical RRULE value for a stored pattern, or None for legacy free-text patterns."""
+    try:
+        rule = parse_rrule(pattern)
+    except ValueError:
+        return None
+    parts = [f"FREQ={rule.freq}"]
+    if rule.interval != 1:
+        parts.append(f"INTERVAL={rule.interval}")
+    if rule.count is not None:
+        parts.append(f"COUNT={rule.count}")
+    if rule.until is not None:
+        parts.append(f"UNTIL={_ics_time(rule.until)}")
+    if rule.byday:
+        names = {index: name for name, index in WEEKDAYS.items()}
+        parts.append("BYDAY=" + ",".join(names[day] for day in rule.byday))
+    return ";".join(parts)
+
+class EventExportService:
+    """Streams a user's calendar; owns its session because the body outlives the request handler."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = EventRepository(db)
+
+    def export(
+        self,
+        user_id: int,
+        fmt: ExportFormat,
+        scope: EventScope = EventScope.accessible,
+        expand: bool = False,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+    ) -> Iterator[str]:
+        """Yield the export in pieces of roughly EVENT_EXPORT_FLUSH_BYTES characters."""
+        try:
+            rows = self.repo.stream_by_user(
+                user_id, scope, window_start, window_end, settings.EVENT_EXPORT_BATCH_SIZE
+            )
+            render = self._render_ics if fmt == ExportFormat.ics else self._render_ndjson
+            buffer, size = [], 0
+            for piece in render(rows, expand, window_start, window_end):
+                buffer.append(piece)
+                size += len(piece)
+                if size >= settings.EVENT_EXPORT_FLUSH_BYTES:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+            if buffer:
+                yield "".join(buffer)
+        except Exception:
+            # Headers are already sent; the truncated body is the only signal left to the client
+            logger.exception("Event export failed for user %s", user_id)
+            raise
+        finally:
+            self.db.close()
+
+    def _occurrences(self, row, expand: bool, window_start: datetime, window_end: datetime) -> Iterable[Occurrence]:
+        if expand and row.is_recurring and row.recurrence_pattern:
+            return expand_pattern(row.start_time, row.end_time, row.recurrence_pattern, window_start, window_end)
+        return [(row.start_time, row.end_time)]
+
+    def _render_ndjson(self, rows, expand: bool, window_start, window_end) -> Iterator[str]:
+        for row in rows:
+            record = {
+                "event_id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "location": row.location,
+                "is_recurring": bool(row.is_recurring),
+                "recurrence_pattern": row.recurrence_pattern,
+                "role": RoleEnum(row.role).value,
+            }
+            for start_time, end_time in self._occurrences(row, expand, window_start, window_end):
+                record["start_time"] = start_time.isoformat()
+                record["end_time"] = end_time.isoformat()
+                yield json.dumps(record) + "\n"
+
+    def _render_ics(self, rows, expand: bool, window_start, window_end) -> Iterator[str]:
+        yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//EventFlow//Event Export//EN\r\nCALSCALE:GREGORIAN\r\n"
+        for row in rows:
+            stamp = _ics_time(row.updated_at or row.start_time)
+            expanded = expand and row.is_recurring and row.recurrence_pattern
+            for start_time, end_time in self._occurrences(row, expand, window_start, window_end):
+                uid = f"event-{row.id}-{_ics_time(start_time)}" if expanded else f"event-{row.id}"
+                lines = [
+                    "BEGIN:VEVENT\r\n",
+                    _ics_line("UID", f"{uid}@eventflow"),
+                    _ics_line("DTSTAMP", stamp),
+                    _ics_line("DTSTART", _ics_time(start_time)),
+                    _ics_line("DTEND", _ics_time(end_time)),
+                    _ics_line("SUMMARY", _ics_escape(row.title)),
+                ]
+                if row.description:
+                    lines.append(_ics_line("DESCRIPTION", _ics_escape(row.description)))
+                if row.location:
+                    lines.append(_ics_line("LOCATION", _ics_escape(row.location)))
+                rrule = None if expanded or not row.is_recurring or not row.recurrence_pattern else _ics_rrule(row.recurrence_pattern)
+                if rrule:
+                    lines.append(_ics_line("RRULE", rrule))
+                lines.append("END:VEVENT\r\n")
+                yield "".join(lines)
+        yield "END:VCALENDAR\r\n"
@@ -0,0 +1,123 @@
+from fastapi import HTTPException, status
+from typing import Iterable, Iterator, List, Tuple, Union
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from app.core.config import settings
+from app.repositories.event_repository import EventRepository
+from app.schemas.event import EventBase, ImportFormat
+import codecs
+import csv
+import json
+
+ImportRow = Tuple[int, Union[dict, str]]  # (line number, parsed row or error message)
+
+def _iter_lines(body: Iterable[bytes]) -> Iterator[str]:
+    """Decode a byte stream into lines (keeping the newline) without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    for chunk in body:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+def _iter_ndjson(lines: Iterable[str]) -> Iterator[ImportRow]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, "Expected a JSON object"
+            continue
+        yield line_number, row
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[ImportRow]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, "Row has more columns than the header"
+            continue
+        # Empty cells mean "not set" so schema defaults apply
+        yield reader.line_num, {key: value for key, value in row.items() if value not in ("", None)}
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"] for err in error.errors()
+    )
+
+class EventImportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = EventRepository(db)
+
+    def import_events(self, owner_id: int, body: Iterable[bytes], fmt: ImportFormat) -> dict:
+        """Stream rows from ``body``, validate them and load them chunk by chunk.
+
+        Only one chunk of validated rows is held in memory at a time. Each chunk commits
+        on its own, so a chunk that fails to load does not undo the chunks before it.
+        """
+        try:
+            lines = _iter_lines(body)
+            rows = _iter_csv(lines) if fmt == ImportFormat.csv else _iter_ndjson(lines)
+            chunk_size = settings.EVENT_IMPORT_CHUNK_SIZE
+            summary = {"rows": 0, "imported": 0, "failed": 0, "chunks": []}
+
+            valid: List[EventBase] = []
+            report = self._new_chunk_report(1)
+            for line_number, row in rows:
+                report["rows"] += 1
+                try:
+                    if isinstance(row, str):
+                        raise ValueError(row)
+                    valid.append(EventBase(**row))
+                except ValidationError as e:
+                    self._record_error(report, line_number, _validation_message(e))
+                except (ValueError, TypeError) as e:
+                    self._record_error(report, line_number, str(e))
+                if report["rows"] >= chunk_size:
+                    self._flush_chunk(owner_id, valid, report, summary)
+                    valid = []
+                    report = self._new_chunk_report(report["chunk"] + 1)
+            if report["rows"]:
+                self._flush_chunk(owner_id, valid, report, summary)
+            return summary
+        except HTTPException:
+            raise
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to import events: {str(e)}"
+            )
+
+    @staticmethod
+    def _new_chunk_report(number: int) -> dict:
+        return {"chunk": number, "rows": 0, "imported": 0, "failed": 0, "errors": []}
+
+    @staticmethod
+    def _record_error(report: dict, line_number: int, message: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < settings.EVENT_IMPORT_MAX_ERRORS_PER_CHUNK:
+            report["errors"].append({"line": line_number, "error": message})
+
+    def _flush_chunk(self, owner_id: int, valid: List[EventBase], report: dict, summary: dict) -> None:
+        if valid:
+            try:
+                event_ids = self.repo.copy_import_chunk(valid, owner_id)
+                self.db.commit()
+                report["imported"] = len(event_ids)
+            except Exception as e:
+                self.db.rollback()
+                report["failed"] += len(valid)
+                report["errors"].append({"line": None, "error": getattr(e, "detail", str(e))})
+        summary["rows"] += report["rows"]
+        summary["imported"] += report["imported"]
+        summary["failed"] += report["failed"]
+        summary["chunks"].append(report)
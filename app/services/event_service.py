@@ -1,13 +1,23 @@
 from fastapi import HTTPException, status
-from typing import Optional, List
+from typing import Collection, Optional, List, Tuple
 from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
+from app.core.etag import event_etag, if_match_satisfied
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.permission import EventAccess
+from app.core.permission_cache import invalidate_permission
+from app.core.recurrence import expand_event, occurrence_cache
 from app.repositories.event_repository import EventRepository
 from app.repositories.collaboration_repository import CollaborationRepository
-from app.schemas.event import EventBase, EventUpdate, EventCreateBatch
+from app.repositories.occurrence_repository import OccurrenceRepository, occurrence_store_covers
+from app.schemas.event import EventBase, EventUpdate, EventCreateBatch, EventScope, ConflictMode, EVENT_HISTORY_FIELDS
 from app.models.changelog import Changelog
 from app.models.permission import RoleEnum
 from app.models.event import Event
-from datetime import datetime
+from datetime import datetime, timedelta
+from bisect import bisect_left
+from itertools import islice
+import heapq
 
 class EventService:
     def __init__(self, db: Session):
@@ -15,21 +25,34 @@ class EventService:
         self.repo = EventRepository(db)
         self.collab_repo = CollaborationRepository(db)
 
-    def create_event(self, user_id: int, data: EventBase) -> Event:
+    def create_event(
+        self,
+        user_id: int,
+        data: EventBase,
+        include: Collection[str] = EVENT_HISTORY_FIELDS,
+        conflict_mode: ConflictMode = ConflictMode.ignore,
+    ) -> Event:
         try:
+            conflicts = self._check_conflicts(user_id, [(data.start_time, data.end_time)], conflict_mode)
             event = self.repo.create(user_id, data)
             self.collab_repo.create_role(event.id, user_id, RoleEnum.owner)
             changelog = Changelog(
                 event_id=event.id,
                 version_id=None,
+                version_number=1,
                 changes={},
                 description="Event created",
                 created_by=user_id
             )
             self.db.add(changelog)
             self.db.commit()
-            self.db.refresh(event)
+            invalidate_permission(event.id, user_id)
+            event = self.repo.get(event.id, include)
+            if conflict_mode == ConflictMode.warn:
+                event.conflicts = conflicts[0]
             return event
+        except HTTPException:
+            raise
         except Exception as e:
             self.db.rollback()
             raise HTTPException(
@@ -37,20 +60,17 @@ class EventService:
                 detail=f"Failed to create event: {str(e)}"
             )
 
-    def get_event(self, event_id: int, requester_id: int) -> Optional[Event]:
+    def get_event(self, access: EventAccess, include: Collection[str] = EVENT_HISTORY_FIELDS) -> Event:
+        """The event authorized by ``require_event_role``; it is only fetched again for ``include``."""
         try:
-            event = self.repo.get(event_id)
+            if not include:
+                return access.event
+            event = self.repo.get(access.event_id, include)
             if not event:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Event not found"
                 )
-            permission = self.collab_repo.get_by_event_and_user(event_id, requester_id)
-            if not permission:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Permission denied"
-                )
             return event
         except HTTPException:
             raise
@@ -60,31 +80,102 @@ class EventService:
                 detail=f"Failed to retrieve event: {str(e)}"
             )
 
-    def list_events(self, user_id: int) -> List[Event]:
+    def _check_if_match(self, event_id: int, if_match: Optional[str]) -> None:
+        """Lock the event and reject the write with 412 if ``if_match`` names another version."""
+        if if_match is None:
+            return
+        event = self.repo.get(event_id, for_update=True)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        etag = event_etag(event.id, event.current_version)
+        if not if_match_satisfied(if_match, etag):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Event has been modified",
+                headers={"ETag": etag}
+            )
+
+    def list_events(
+        self,
+        user_id: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+        is_recurring: Optional[bool] = None,
+        location: Optional[str] = None,
+        scope: EventScope = EventScope.owned,
+        include: Collection[str] = (),
+    ) -> Tuple[List[Event], Optional[str]]:
         try:
-            return self.repo.list_by_user(user_id)
+            after = None
+            if cursor:
+                values = decode_cursor(cursor)
+                try:
+                    after = (datetime.fromisoformat(values["start_time"]), int(values["id"]))
+                except (KeyError, TypeError, ValueError):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid pagination cursor"
+                    )
+            events = self.repo.list_by_user(
+                user_id, limit + 1, after=after, window_start=window_start,
+                window_end=window_end, is_recurring=is_recurring, location=location, scope=scope,
+                include=include
+            )
+            next_cursor = None
+            if len(events) > limit:
+                events = events[:limit]
+                last = events[-1]
+                next_cursor = encode_cursor({"start_time": last.start_time.isoformat(), "id": last.id})
+            return events, next_cursor
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to list events: {str(e)}"
             )
 
-    def update_event(self, event_id: int, data: EventUpdate, user_id: int) -> Event:
+    def update_event(
+        self,
+        access: EventAccess,
+        data: EventUpdate,
+        include: Collection[str] = EVENT_HISTORY_FIELDS,
+        conflict_mode: ConflictMode = ConflictMode.ignore,
+        if_match: Optional[str] = None,
+    ) -> Event:
+        """Apply ``data`` to the event authorized by ``require_event_role`` (editor or above)."""
+        event_id, user_id = access.event_id, access.user.id
         try:
-            permission = self.collab_repo.get_by_event_and_user(event_id, user_id)
-            if not permission or permission.role not in [RoleEnum.owner, RoleEnum.editor]:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Permission denied"
-                )
+            self._check_if_match(event_id, if_match)
+
+            conflicts = []
+            if data.start_time or data.end_time:
+                current = access.event
+                new_range = (data.start_time or current.start_time, data.end_time or current.end_time)
+                # EventUpdate only checks the order when both ends are sent
+                if new_range[1] <= new_range[0]:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                        detail="end_time must be after start_time"
+                    )
+                if conflict_mode != ConflictMode.ignore:
+                    conflicts = self._check_conflicts(user_id, [new_range], conflict_mode, event_id)[0]
 
-            event = self.repo.update(event_id, data)
+            event = self.repo.update(event_id, data, user_id)
             if not event:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Event not found"
                 )
             self.db.commit()
+            event = self.repo.get(event_id, include)
+            if conflict_mode == ConflictMode.warn:
+                event.conflicts = conflicts
             return event
         except HTTPException:
             raise
@@ -95,11 +186,40 @@ class EventService:
                 detail=f"Failed to update event: {str(e)}"
             )
 
-    def create_batch(self, data: EventCreateBatch, owner_id: int) -> List[Event]:
+    def create_batch(
+        self,
+        data: EventCreateBatch,
+        owner_id: int,
+        include: Collection[str] = (),
+        conflict_mode: ConflictMode = ConflictMode.ignore,
+    ) -> List[dict]:
         try:
-            events = self.repo.create_batch(data.events, owner_id)
+            conflicts = self._check_conflicts(
+                owner_id, [(item.start_time, item.end_time) for item in data.events], conflict_mode
+            )
+            results = self.repo.create_batch(data.events, owner_id, settings.EVENT_BATCH_CHUNK_SIZE)
             self.db.commit()
-            return events
+
+            created_ids = [event_id for _, event_id, _ in results if event_id is not None]
+            events = {}
+            for offset in range(0, len(created_ids), settings.EVENT_BATCH_CHUNK_SIZE):
+                chunk_ids = created_ids[offset:offset + settings.EVENT_BATCH_CHUNK_SIZE]
+                events.update((event.id, event) for event in self.repo.get_many(chunk_ids, include))
+
+            items = []
+            for index, event_id, error in results:
+                event = events.get(event_id)
+                if event is not None and conflict_mode == ConflictMode.warn:
+                    event.conflicts = conflicts[index]
+                items.append({
+                    "index": index,
+                    "status": "created" if event_id is not None else "failed",
+                    "event": event,
+                    "error": error,
+                })
+            return items
+        except HTTPException:
+            raise
         except Exception as e:
             self.db.rollback()
             raise HTTPException(
@@ -107,8 +227,9 @@ class EventService:
                 detail=f"Failed to create events in batch: {str(e)}"
             )
 
-    def delete_event(self, event_id: int):
+    def delete_event(self, event_id: int, if_match: Optional[str] = None):
         try:
+            self._check_if_match(event_id, if_match)
             success = self.repo.delete(event_id)
             if not success:
                 raise HTTPException(
@@ -116,6 +237,7 @@ class EventService:
                     detail="Event not found"
                 )
             self.db.commit()
+            invalidate_permission(event_id)
             return {"detail": "Deleted"}
         except HTTPException:
             raise
@@ -126,6 +248,154 @@ class EventService:
                 detail=f"Failed to delete event: {str(e)}"
             )
 
+    def find_conflicts(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_event_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[dict]:
+        try:
+            if end_time <= start_time:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="end_time must be after start_time"
+                )
+            rows = self._overlapping_occurrences(user_id, start_time, end_time, exclude_event_id)
+            first_per_event = {}
+            for row in rows:
+                first_per_event.setdefault(row[0], row)
+            return [
+                {"id": id, "title": title, "start_time": start, "end_time": end, "role": role}
+                for id, title, start, end, role in list(first_per_event.values())[:limit]
+            ]
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to check conflicts: {str(e)}"
+            )
+
+    def _overlapping_occurrences(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_event_id: Optional[int] = None,
+    ) -> List[Tuple[int, str, datetime, datetime, RoleEnum]]:
+        """Accessible one-off events and expanded series occurrences in the range, by start."""
+        rows = list(
+            self.repo.find_overlapping(user_id, start_time, end_time, exclude_event_id, exclude_series=True)
+        )
+        if occurrence_store_covers(end_time):
+            rows.extend(
+                OccurrenceRepository(self.db).find_overlapping(user_id, start_time, end_time, exclude_event_id)
+            )
+            rows.sort(key=lambda row: (row[2], row[0]))
+            return rows
+        for id, title, start, end, role, pattern in self.repo.find_recurring_series(
+            user_id, end_time, exclude_event_id
+        ):
+            for occurrence_start, occurrence_end in occurrence_cache.expand(
+                id, start, end, pattern, start_time, end_time
+            ):
+                rows.append((id, title, occurrence_start, occurrence_end, role))
+        rows.sort(key=lambda row: (row[2], row[0]))
+        return rows
+
+    def list_occurrences(
+        self,
+        user_id: int,
+        window_start: datetime,
+        window_end: datetime,
+        scope: EventScope = EventScope.owned,
+        limit: int = 500,
+    ) -> List[dict]:
+        try:
+            if window_end <= window_start:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="window_end must be after window_start"
+                )
+            if window_end - window_start > timedelta(days=settings.RECURRENCE_MAX_WINDOW_DAYS):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Window may not exceed {settings.RECURRENCE_MAX_WINDOW_DAYS} days"
+                )
+            use_store = occurrence_store_covers(window_end)
+            events = self.repo.list_for_window(
+                user_id, window_start, window_end, scope, include_series=not use_store
+            )
+            # Each event's occurrences are generated lazily and merged in start order, so only
+            # the first `limit` occurrences are ever expanded
+            streams = [
+                ((start, end, event) for start, end in expand_event(event, window_start, window_end))
+                for event in events
+            ]
+            if use_store:
+                stored = OccurrenceRepository(self.db).list_for_window(
+                    user_id, window_start, window_end, scope, limit
+                )
+                for event, _, _, role in stored:
+                    event.role = RoleEnum(role)
+                streams.append((start, end, event) for event, start, end, _ in stored)
+            merged = heapq.merge(*streams, key=lambda item: (item[0], item[2].id))
+            return [
+                {
+                    "event_id": event.id,
+                    "title": event.title,
+                    "start_time": start,
+                    "end_time": end,
+                    "location": event.location,
+                    "is_recurring": bool(event.is_recurring),
+                    "role": event.role,
+                }
+                for start, end, event in islice(merged, limit)
+            ]
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to list occurrences: {str(e)}"
+            )
+
+    def _check_conflicts(
+        self,
+        user_id: int,
+        ranges: List[Tuple[datetime, datetime]],
+        mode: ConflictMode,
+        exclude_event_id: Optional[int] = None,
+    ) -> List[List[int]]:
+        """Ids of existing accessible events overlapping each range, in input order.
+
+        Uses one range query over the ranges' bounding window. Raises 409 in reject mode.
+        """
+        if mode == ConflictMode.ignore or not ranges:
+            return [[] for _ in ranges]
+        window_start = min(start for start, _ in ranges)
+        window_end = max(end for _, end in ranges)
+        existing = self._overlapping_occurrences(user_id, window_start, window_end, exclude_event_id)
+        existing_starts = [row[2] for row in existing]
+        conflicts = []
+        for start, end in ranges:
+            # existing is ordered by start_time, so only rows starting before `end` can overlap
+            candidates = existing[:bisect_left(existing_starts, end)]
+            conflicts.append(list(dict.fromkeys(row[0] for row in candidates if row[3] > start)))
+        if mode == ConflictMode.reject and any(conflicts):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Event overlaps existing events",
+                    "conflicts": [
+                        {"index": index, "event_ids": ids} for index, ids in enumerate(conflicts) if ids
+                    ],
+                }
+            )
+        return conflicts
+
     def get_event_with_versions(self, event_id: int) -> Optional[Event]:
         try:
             event = self.db.query(Event)\
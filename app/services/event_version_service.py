@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from app.repositories.event_version_repository import EventVersionRepository
+from app.repositories.event_version_repository import EventVersionRepository, VERSIONED_FIELDS, version_state
 from app.repositories.event_repository import EventRepository
 from app.models import Event, EventVersion
-from typing import List, Dict, Any
+from app.core.diff_cache import diff_cache
+from app.core.etag import event_etag, if_match_satisfied
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.recurrence import occurrence_cache
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
 
 class EventVersionService:
     def __init__(self, db: Session):
@@ -28,7 +33,9 @@ class EventVersionService:
                 detail=f"Error fetching version: {str(e)}"
             )
 
-    def rollback_to_version(self, event_id: int, version_id: int) -> Event:
+    def rollback_to_version(
+        self, event_id: int, version_id: int, if_match: Optional[str] = None, created_by: Optional[int] = None
+    ) -> Event:
         try:
             version = self.version_repo.get_by_id(event_id, version_id)
             if not version:
@@ -37,21 +44,44 @@ class EventVersionService:
                     detail="Version not found"
                 )
 
-            event = self.event_repo.get(event_id)
+            event = self.event_repo.get(event_id, for_update=True)
             if not event:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Event not found"
                 )
+            etag = event_etag(event.id, event.current_version)
+            if not if_match_satisfied(if_match, etag):
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail="Event has been modified",
+                    headers={"ETag": etag}
+                )
+
+            state = self.version_repo.materialize(event_id, version.version_number)
+            if state is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Version history is incomplete"
+                )
 
-            for key in [
-                'title', 'description', 'start_time', 'end_time',
-                'location', 'is_recurring', 'recurrence_pattern'
-            ]:
-                if key in version.version_data:
-                    setattr(event, key, version.version_data[key])
+            previous_state = version_state(event)
+            for key in VERSIONED_FIELDS:
+                if key in state:
+                    value = state[key]
+                    # version_data is JSON, so datetimes come back as ISO strings
+                    if key in ('start_time', 'end_time') and isinstance(value, str):
+                        value = datetime.fromisoformat(value)
+                    setattr(event, key, value)
+            self.db.flush()
+            # The rollback itself is a new version so later deltas apply to the restored state
+            self.event_repo.record_version(
+                event, previous_state, created_by or event.owner_id, f"Rolled back to version {version.version_number}"
+            )
+            self.event_repo.sync_occurrences(event)
 
             self.db.commit()
+            occurrence_cache.invalidate(event_id)
             self.db.refresh(event)
             return event
         except HTTPException:
@@ -63,15 +93,60 @@ class EventVersionService:
                 detail=f"Rollback failed: {str(e)}"
             )
 
-    def get_changgelog(self, event_id: int) -> List[EventVersion]:
+    def get_version_state(self, event_id: int, version_id: int) -> Dict[str, Any]:
         try:
-            versions = self.version_repo.get_versions_by_event(event_id)
-            if not versions:
+            version = self.get_version_by_id(event_id, version_id)
+            state = self.version_repo.materialize(event_id, version.version_number)
+            if state is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Version history is incomplete"
+                )
+            return state
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error materializing version: {str(e)}"
+            )
+
+    def get_changgelog(
+        self,
+        event_id: int,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        created_by: Optional[int] = None,
+        include_data: bool = True,
+    ) -> Tuple[List[EventVersion], Optional[str]]:
+        try:
+            after_version = 0
+            if cursor:
+                values = decode_cursor(cursor)
+                try:
+                    after_version = int(values["version_number"])
+                except (KeyError, TypeError, ValueError):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid pagination cursor"
+                    )
+            versions = self.version_repo.list_versions_page(
+                event_id, limit + 1, after_version, since=since, until=until,
+                created_by=created_by, include_data=include_data
+            )
+            filtered = since is not None or until is not None or created_by is not None
+            if not versions and not cursor and not filtered:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="No versions found for the event"
                 )
-            return versions
+            next_cursor = None
+            if len(versions) > limit:
+                versions = versions[:limit]
+                next_cursor = encode_cursor({"version_number": versions[-1].version_number})
+            return versions, next_cursor
         except HTTPException:
             raise
         except Exception as e:
@@ -82,20 +157,33 @@ class EventVersionService:
 
     def get_diff(self, event_id: int, v1_id: int, v2_id: int) -> Dict[str, Dict[str, Any]]:
         try:
-            v1 = self.get_version_by_id(event_id, v1_id)
-            v2 = self.get_version_by_id(event_id, v2_id)
+            numbers = self.version_repo.get_version_numbers(event_id, [v1_id, v2_id])
+            if v1_id not in numbers or v2_id not in numbers:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Version not found"
+                )
+            number1, number2 = numbers[v1_id], numbers[v2_id]
 
-            diff = {}
-            data1 = v1.version_data
-            data2 = v2.version_data
+            key = (event_id, number1, number2)
+            diff = diff_cache.get(key)
+            if diff is not None:
+                return diff
 
-            all_keys = set(data1.keys()).union(data2.keys())
-            for key in all_keys:
-                val1 = data1.get(key)
-                val2 = data2.get(key)
-                if val1 != val2:
-                    diff[key] = {"from": val1, "to": val2}
+            diff = self.version_repo.compose_diff(event_id, number1, number2)
+            if diff is None:
+                # Some steps predate stored diffs; compare the materialized states instead
+                data1 = self.version_repo.materialize(event_id, number1) or {}
+                data2 = self.version_repo.materialize(event_id, number2) or {}
+                diff = {}
+                all_keys = set(data1.keys()).union(data2.keys())
+                for key_name in all_keys:
+                    val1 = data1.get(key_name)
+                    val2 = data2.get(key_name)
+                    if val1 != val2:
+                        diff[key_name] = {"from": val1, "to": val2}
 
+            diff_cache.put(key, diff)
             return diff
         except HTTPException:
             raise
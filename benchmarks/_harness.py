@@ -0,0 +1,72 @@
+"""Shared setup for the benchmark scripts in this directory.
+
+Run a benchmark from the repository root with ``python -m benchmarks.<name>``. Benchmarks use
+BENCH_DATABASE_URL when it is set (point it at a scratch PostgreSQL database to measure the
+production code paths) and a throwaway SQLite file otherwise. Every run starts from an
+empty schema, so never point BENCH_DATABASE_URL at a database you care about.
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = os.environ.get(
+    "BENCH_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'eventflow-bench.db')}"
+)
+
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Sequence
+from sqlalchemy import insert
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.security import create_access_token
+from app.db.base import Base, SessionLocal, engine
+from app.models.user import User
+
+def reset_database() -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+def create_users(count: int, prefix: str = "user", hashed_password: str = "!") -> List[int]:
+    """Insert ``count`` users in one statement; the placeholder hash cannot be logged into."""
+    db = SessionLocal()
+    try:
+        ids = db.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com", "hashed_password": hashed_password}
+                for i in range(count)
+            ],
+        ).all()
+        db.commit()
+        return list(ids)
+    finally:
+        db.close()
+
+def auth_headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+class Timer:
+    seconds: float = 0.0
+
+@contextmanager
+def timer() -> Iterator[Timer]:
+    result = Timer()
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.seconds = time.perf_counter() - started
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(pct) - 1]
+
+def report(title: str, headers: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    cells = [list(map(str, headers))] + [[f"{c:.2f}" if isinstance(c, float) else str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    print(f"\n{title} ({engine.dialect.name})")
+    for index, row in enumerate(cells):
+        print("  " + "  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if index == 0:
+            print("  " + "  ".join("-" * width for width in widths))
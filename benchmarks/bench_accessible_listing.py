@@ -0,0 +1,89 @@
+"""Keyset pages of GET /api/events/?scope=accessible|shared for a user with 100k permissions.
+
+Access and role come from one join of events to permissions on uix_user_event, so a page
+costs the same number of statements, and roughly the same time, at the first, middle and
+last cursor. Other users' permissions are seeded alongside to keep the index realistic.
+
+    python -m benchmarks.bench_accessible_listing --permissions 100000 --other-users 2
+"""
+from benchmarks import _harness
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.core.pagination import encode_cursor
+from app.db.base import SessionLocal
+from app.db.query_counter import count_queries
+from app.models.event import Event
+from app.models.permission import Permission, RoleEnum
+from app.schemas.event import EventScope
+from app.services.event_service import EventService
+
+BASE_TIME = datetime(2025, 1, 1)
+CHUNK = 10000
+
+def _seed(permissions: int, other_users: int) -> int:
+    owner_id, user_id, *others = _harness.create_users(2 + other_users)
+    db = SessionLocal()
+    try:
+        for start in range(0, permissions, CHUNK):
+            rows = [
+                {
+                    "title": f"event {i}", "owner_id": owner_id, "current_version": 1,
+                    "start_time": BASE_TIME + timedelta(minutes=30 * i),
+                    "end_time": BASE_TIME + timedelta(minutes=30 * i + 25),
+                }
+                for i in range(start, min(start + CHUNK, permissions))
+            ]
+            event_ids = db.scalars(insert(Event).returning(Event.id, sort_by_parameter_order=True), rows).all()
+            grants = [{"user_id": owner_id, "event_id": event_id, "role": RoleEnum.owner} for event_id in event_ids]
+            for holder in [user_id, *others]:
+                grants += [
+                    {"user_id": holder, "event_id": event_id, "role": RoleEnum.editor if event_id % 3 else RoleEnum.viewer}
+                    for event_id in event_ids
+                ]
+            db.execute(insert(Permission), grants)
+        db.commit()
+        return user_id
+    finally:
+        db.close()
+
+def _cursor_at(index: int) -> str:
+    # Event ids follow insertion order on an empty schema, so the n-th event has id n + 1
+    return encode_cursor({"start_time": (BASE_TIME + timedelta(minutes=30 * index)).isoformat(), "id": index + 1})
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--permissions", type=int, default=100000)
+    parser.add_argument("--other-users", type=int, default=2)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    _harness.reset_database()
+    with _harness.timer() as seeding:
+        user_id = _seed(args.permissions, args.other_users)
+    print(f"seeded {args.permissions} events and {args.permissions * (2 + args.other_users)} permissions in {seeding.seconds:.1f} s")
+
+    positions = (("first", None), ("middle", _cursor_at(args.permissions // 2)), ("last", _cursor_at(args.permissions - args.limit - 1)))
+    rows = []
+    for scope in (EventScope.accessible, EventScope.shared):
+        for label, cursor in positions:
+            samples = []
+            for _ in range(args.repeat):
+                db = SessionLocal()
+                try:
+                    with count_queries() as counter, _harness.timer() as elapsed:
+                        events, _ = EventService(db).list_events(user_id, args.limit, cursor=cursor, scope=scope)
+                    samples.append(elapsed.seconds * 1000)
+                finally:
+                    db.close()
+            rows.append((scope.value, label, len(events), counter.count, statistics.median(samples), _harness.percentile(samples, 95)))
+    _harness.report(
+        f"EventService.list_events: {args.permissions} permissions for the caller, limit {args.limit}, {args.repeat} runs",
+        ("scope", "page", "rows", "statements", "median ms", "p95 ms"),
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
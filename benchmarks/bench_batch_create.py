@@ -0,0 +1,85 @@
+"""POST /api/events/batch with 10k events: bulk chunked inserts vs. row-at-a-time ORM writes.
+
+The baseline writes the same rows per event as the single-create path (event, v1 version,
+owner permission, "Event created" changelog), flushing each event to get its id, in one
+transaction. The batch path inserts each table once per EVENT_BATCH_CHUNK_SIZE chunk.
+
+    python -m benchmarks.bench_batch_create --events 10000
+"""
+from benchmarks import _harness
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.query_counter import count_queries
+from app.models.changelog import Changelog
+from app.models.event import Event
+from app.models.permission import Permission, RoleEnum
+from app.repositories.event_repository import EventRepository
+from app.schemas.event import EventBase
+from main import app
+
+def _items(count: int) -> list:
+    start = datetime(2025, 1, 1, 9)
+    return [
+        {
+            "title": f"event {i}",
+            "start_time": (start + timedelta(minutes=30 * i)).isoformat(),
+            "end_time": (start + timedelta(minutes=30 * i + 25)).isoformat(),
+            "location": "room 1",
+        }
+        for i in range(count)
+    ]
+
+def _row_at_a_time(owner_id: int, items: list) -> None:
+    db = SessionLocal()
+    try:
+        repo = EventRepository(db)
+        for item in items:
+            data = EventBase(**item)
+            event = Event(**data.model_dump(), owner_id=owner_id)
+            db.add(event)
+            db.flush()
+            repo.create_event_version(event.id, 1, data.model_dump(mode="json"), owner_id)
+            db.add(Permission(event_id=event.id, user_id=owner_id, role=RoleEnum.owner))
+            db.add(Changelog(event_id=event.id, version_number=1, changes={}, description="Event created", created_by=owner_id))
+            db.flush()
+        db.commit()
+    finally:
+        db.close()
+
+async def _post_batch(headers: dict, items: list) -> int:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post("/api/events/batch", json={"events": items}, headers=headers)
+        response.raise_for_status()
+        return sum(1 for item in response.json() if item["status"] == "created")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10000)
+    args = parser.parse_args()
+
+    _harness.reset_database()
+    baseline_owner, batch_owner = _harness.create_users(2)
+    items = _items(args.events)
+
+    rows = []
+    with count_queries() as counter, _harness.timer() as elapsed:
+        _row_at_a_time(baseline_owner, items)
+    rows.append(("row-at-a-time ORM (before)", args.events, counter.count, elapsed.seconds, args.events / elapsed.seconds))
+
+    with count_queries() as counter, _harness.timer() as elapsed:
+        created = asyncio.run(_post_batch(_harness.auth_headers(batch_owner), items))
+    rows.append(("POST /api/events/batch (after)", created, counter.count, elapsed.seconds, created / elapsed.seconds))
+
+    _harness.report(
+        f"{args.events} events in one request, EVENT_BATCH_CHUNK_SIZE={settings.EVENT_BATCH_CHUNK_SIZE}",
+        ("path", "created", "statements", "seconds", "events/s"),
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
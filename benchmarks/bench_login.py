@@ -0,0 +1,68 @@
+"""Login storm: throughput, 503 rejections and event-loop responsiveness.
+
+Logins hash on the password-hashing pool and are awaited from the route, outside run_db, so a
+storm neither holds DB worker slots nor stalls the loop. While the storm runs, a probe issues
+``GET /`` every few milliseconds; its latency shows whether the loop stays free. Logins past
+PASSWORD_HASH_MAX_PENDING are answered with 503 instead of queueing.
+
+    PASSWORD_HASH_ROUNDS=10 python -m benchmarks.bench_login --logins 200 --concurrency 100
+"""
+from benchmarks import _harness
+import argparse
+import asyncio
+import time
+import httpx
+from passlib.context import CryptContext
+from app.core.config import settings
+from main import app
+
+async def _run(usernames, concurrency: int) -> tuple:
+    gate = asyncio.Semaphore(concurrency)
+    statuses = {}
+    probes = []
+    done = asyncio.Event()
+
+    async def login(client: httpx.AsyncClient, username: str) -> None:
+        async with gate:
+            response = await client.post("/api/auth/login", data={"username": username, "password": "bench-password"})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def probe(client: httpx.AsyncClient) -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/")
+            probes.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        prober = asyncio.create_task(probe(client))
+        with _harness.timer() as elapsed:
+            await asyncio.gather(*(login(client, username) for username in usernames))
+        done.set()
+        await prober
+    return statuses.get(200, 0) / elapsed.seconds, statuses, _harness.percentile(probes, 50), _harness.percentile(probes, 99)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    _harness.reset_database()
+    # Every account shares one real hash; computing 200 of them would dominate the setup
+    hashed = CryptContext(schemes=["bcrypt"], bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS).hash("bench-password")
+    _harness.create_users(args.logins, prefix="login", hashed_password=hashed)
+    usernames = [f"login{i}" for i in range(args.logins)]
+
+    throughput, statuses, p50, p99 = asyncio.run(_run(usernames, args.concurrency))
+    _harness.report(
+        f"POST /api/auth/login: {args.logins} logins, concurrency {args.concurrency}, "
+        f"bcrypt rounds {settings.PASSWORD_HASH_ROUNDS}, {settings.PASSWORD_HASH_WORKERS} hash workers, "
+        f"max pending {settings.PASSWORD_HASH_MAX_PENDING}",
+        ("logins/s", "200", "401", "503", "probe p50 ms", "probe p99 ms"),
+        [(throughput, statuses.get(200, 0), statuses.get(401, 0), statuses.get(503, 0), p50, p99)],
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Read-heavy permission checks with the per-process permission cache off and on.
+
+Workers look up roles for (event, user) pairs drawn from a skewed hot set, as repeated
+page loads and polling do. A small share of operations change a role and invalidate it.
+Every SQL statement gets an artificial delay (``--latency-ms``) standing in for the
+round-trip to Postgres.
+
+    python -m benchmarks.bench_permission_cache --operations 20000 --write-ratio 0.01
+"""
+from benchmarks import _harness
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import event, insert, update
+from app.db.base import SessionLocal, engine
+from app.db.query_counter import count_queries
+from app.models.event import Event
+from app.models.permission import Permission, RoleEnum
+from app.core.permission_cache import invalidate_permission, permission_cache
+from app.repositories.collaboration_repository import CollaborationRepository
+
+def _seed(events: int, users: int) -> tuple:
+    owner_id, *user_ids = _harness.create_users(users + 1)
+    db = SessionLocal()
+    try:
+        event_ids = db.scalars(
+            insert(Event).returning(Event.id, sort_by_parameter_order=True),
+            [{"title": f"event {i}", "owner_id": owner_id, "start_time": datetime(2025, 1, 1, 9), "end_time": datetime(2025, 1, 1, 10)} for i in range(events)],
+        ).all()
+        db.execute(insert(Permission), [
+            {"event_id": event_id, "user_id": user_id, "role": RoleEnum.viewer}
+            for event_id in event_ids for user_id in user_ids
+        ])
+        db.commit()
+        return list(event_ids), user_ids
+    finally:
+        db.close()
+
+def _workload(pairs: list, operations: int, write_ratio: float, seed: int) -> list:
+    rng = random.Random(seed)
+    # Zipf-like skew: a few events and users account for most checks
+    weights = [1 / (rank + 1) for rank in range(len(pairs))]
+    return [(rng.random() < write_ratio, pair) for pair in rng.choices(pairs, weights=weights, k=operations)]
+
+def _run(workload: list, workers: int) -> float:
+    def one(chunk: list) -> None:
+        db = SessionLocal()
+        try:
+            repo = CollaborationRepository(db)
+            for is_write, (event_id, user_id) in chunk:
+                if is_write:
+                    db.execute(
+                        update(Permission)
+                        .where(Permission.event_id == event_id, Permission.user_id == user_id)
+                        .values(role=RoleEnum.editor)
+                    )
+                    db.commit()
+                    invalidate_permission(event_id, user_id)
+                else:
+                    repo.get_role(event_id, user_id)
+                    db.rollback()  # end the read transaction, as a request would
+        finally:
+            db.close()
+
+    chunks = [workload[i::workers] for i in range(workers)]
+    with _harness.timer() as elapsed, ThreadPoolExecutor(workers) as pool:
+        list(pool.map(one, chunks))
+    return elapsed.seconds
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--write-ratio", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    _harness.reset_database()
+    event_ids, user_ids = _seed(args.events, args.users)
+    pairs = [(event_id, user_id) for event_id in event_ids for user_id in user_ids]
+    random.Random(0).shuffle(pairs)
+    workload = _workload(pairs, args.operations, args.write_ratio, seed=1)
+
+    delay = args.latency_ms / 1000
+    event.listen(engine, "before_cursor_execute", lambda *_: time.sleep(delay))
+
+    rows = []
+    max_size = permission_cache.max_size
+    for label, size in (("cache off (before)", 0), ("cache on (after)", max_size)):
+        permission_cache.max_size = size
+        permission_cache.clear()
+        permission_cache.hits = permission_cache.misses = 0
+        with count_queries() as counter:
+            seconds = _run(workload, args.workers)
+        hit_rate = permission_cache.stats()["hit_rate"] if size else 0.0
+        rows.append((label, args.operations / seconds, counter.count, hit_rate))
+    _harness.report(
+        f"{args.operations} permission checks on {len(pairs)} pairs, {args.write_ratio:.0%} role changes, "
+        f"{args.workers} workers, +{args.latency_ms} ms per statement",
+        ("mode", "ops/s", "statements", "hit rate"),
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
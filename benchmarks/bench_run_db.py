@@ -0,0 +1,73 @@
+"""Concurrent-request throughput with ORM calls inline vs. on the run_db thread pool.
+
+Every SQL statement gets an artificial delay (``--latency-ms``), standing in for the round-trip
+to Postgres or a slow query. Inline, each delay stalls the event loop and requests run one
+at a time. On the thread pool, requests overlap up to the limiter size.
+
+    python -m benchmarks.bench_run_db --requests 400 --concurrency 50 --latency-ms 5
+"""
+from benchmarks import _harness
+import argparse
+import asyncio
+import time
+from datetime import datetime
+import httpx
+from sqlalchemy import event
+from app.core.config import settings
+from app.db.base import SessionLocal, engine
+from app.schemas.event import EventBase
+from app.services.event_service import EventService
+from main import app
+
+async def _run(event_id: int, headers: dict, requests: int, concurrency: int) -> tuple:
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(client: httpx.AsyncClient) -> None:
+        async with gate:
+            started = time.perf_counter()
+            response = await client.get(f"/api/events/{event_id}?include=", headers=headers)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        with _harness.timer() as elapsed:
+            await asyncio.gather(*(one(client) for _ in range(requests)))
+    return requests / elapsed.seconds, _harness.percentile(latencies, 50), _harness.percentile(latencies, 99)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    _harness.reset_database()
+    (user_id,) = _harness.create_users(1)
+    db = SessionLocal()
+    try:
+        event_id = EventService(db).create_event(
+            user_id, EventBase(title="bench", start_time=datetime(2025, 1, 1, 9), end_time=datetime(2025, 1, 1, 10))
+        ).id
+    finally:
+        db.close()
+    headers = _harness.auth_headers(user_id)
+
+    delay = args.latency_ms / 1000
+    event.listen(engine, "before_cursor_execute", lambda *_: time.sleep(delay))
+
+    rows = []
+    for label, threadpool in (("inline (before)", False), ("run_db threadpool (after)", True)):
+        settings.DB_RUN_IN_THREADPOOL = threadpool
+        throughput, p50, p99 = asyncio.run(_run(event_id, headers, args.requests, args.concurrency))
+        rows.append((label, throughput, p50, p99))
+    _harness.report(
+        f"GET /api/events/{{id}}: {args.requests} requests, concurrency {args.concurrency}, "
+        f"+{args.latency_ms} ms per statement",
+        ("mode", "req/s", "p50 ms", "p99 ms"),
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
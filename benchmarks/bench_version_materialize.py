@@ -0,0 +1,99 @@
+"""Materializing an old version of an event with 10k+ versions: snapshots every K vs. replay from v1.
+
+With a full snapshot every EVENT_VERSION_SNAPSHOT_INTERVAL (K) versions, materialize reads the
+nearest snapshot and at most K - 1 deltas, so its cost does not depend on the version's
+position. The baseline replays every delta from v1, as the history did before snapshots.
+
+    python -m benchmarks.bench_version_materialize --versions 12000
+"""
+from benchmarks import _harness
+import argparse
+import statistics
+from datetime import datetime
+from sqlalchemy import insert
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.event import Event
+from app.models.event_version import EventVersion
+from app.repositories.event_version_repository import EventVersionRepository, is_snapshot_version, version_delta
+
+def _state(number: int) -> dict:
+    return {
+        "title": f"title {number}",
+        "description": None,
+        "start_time": datetime(2025, 1, 1, 9).isoformat(),
+        "end_time": datetime(2025, 1, 1, 10).isoformat(),
+        "location": f"room {number // 3}",
+        "is_recurring": False,
+        "recurrence_pattern": None,
+    }
+
+def _seed(owner_id: int, versions: int) -> int:
+    db = SessionLocal()
+    try:
+        event = Event(
+            owner_id=owner_id, current_version=versions, title=f"title {versions}",
+            start_time=datetime(2025, 1, 1, 9), end_time=datetime(2025, 1, 1, 10),
+        )
+        db.add(event)
+        db.flush()
+        rows = []
+        for number in range(1, versions + 1):
+            snapshot = is_snapshot_version(number)
+            data = _state(number) if snapshot else version_delta(_state(number - 1), _state(number))
+            rows.append({"event_id": event.id, "version_number": number, "version_data": data, "is_snapshot": snapshot, "created_by": owner_id})
+        db.execute(insert(EventVersion), rows)
+        db.commit()
+        return event.id
+    finally:
+        db.close()
+
+def _replay_from_first(db, event_id: int, version_number: int) -> dict:
+    state = {}
+    rows = (
+        db.query(EventVersion.version_data)
+        .filter(EventVersion.event_id == event_id, EventVersion.version_number <= version_number)
+        .order_by(EventVersion.version_number.asc())
+    )
+    for (data,) in rows:
+        state.update(data)
+    return state
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--versions", type=int, default=12000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    _harness.reset_database()
+    (owner_id,) = _harness.create_users(1)
+    event_id = _seed(owner_id, args.versions)
+
+    rows = []
+    for target in (100, args.versions // 2, args.versions - 1):
+        timings = {}
+        for label, run in (
+            ("replay from v1 (before)", lambda db: _replay_from_first(db, event_id, target)),
+            ("snapshot + deltas (after)", lambda db: EventVersionRepository(db).materialize(event_id, target)),
+        ):
+            samples = []
+            for _ in range(args.repeat):
+                db = SessionLocal()
+                try:
+                    with _harness.timer() as elapsed:
+                        state = run(db)
+                    samples.append(elapsed.seconds * 1000)
+                finally:
+                    db.close()
+                assert state == _state(target), (label, target)
+            timings[label] = statistics.median(samples)
+        rows.append((target, *timings.values()))
+    _harness.report(
+        f"materialize on one event with {args.versions} versions, snapshot every "
+        f"{settings.EVENT_VERSION_SNAPSHOT_INTERVAL}, median of {args.repeat}",
+        ("version", "replay from v1 ms", "snapshot + deltas ms"),
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,19 @@
+import asyncio
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers.auth import router as auth_router
 from app.routers.event import router as event_router
+from app.routers.feed import router as feed_router
 from app.routers.collaboration import router as collab_router
 from app.routers.event_version import router as event_version_router
+from app.routers.health import router as health_router
+from app.core.security import shutdown_password_hasher
+from app.core.token_blacklist import load_token_blacklist, run_token_blacklist_worker
+from app.core.occurrence_worker import run_occurrence_worker
+from app.core.version_archiver import run_version_archiver
+from app.core.config import settings
+from app.db.base import warm_up_pool
 import uvicorn
 
 app = FastAPI(
@@ -13,9 +23,12 @@ app = FastAPI(
 
 # Register routes
 app.include_router(auth_router)
+# Before the event router so /api/events/feed is not taken for an event id
+app.include_router(feed_router)
 app.include_router(event_router)
 app.include_router(collab_router)
 app.include_router(event_version_router)
+app.include_router(health_router)
 
 # CORS middleware
 app.add_middleware(
@@ -26,6 +39,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+background_tasks = []
+
+@app.on_event("startup")
+async def on_startup():
+    if settings.DB_POOL_WARMUP:
+        # Connecting blocks; keep the loop free for the other startup work
+        await to_thread.run_sync(warm_up_pool)
+    await to_thread.run_sync(load_token_blacklist)
+    background_tasks.append(asyncio.create_task(run_token_blacklist_worker()))
+    if settings.OCCURRENCE_STORE_ENABLED:
+        background_tasks.append(asyncio.create_task(run_occurrence_worker()))
+    if settings.EVENT_VERSION_ARCHIVE_ENABLED:
+        background_tasks.append(asyncio.create_task(run_version_archiver()))
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for task in background_tasks:
+        task.cancel()
+    shutdown_password_hasher()
+
 @app.get("/")
 def read_root():
     return {"message": "Collaborative Event Management API is running"}
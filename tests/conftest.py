@@ -0,0 +1,63 @@
+import itertools
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="eventflow-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.security import create_access_token
+from app.db.base import Base, SessionLocal, engine
+from app.models.user import User
+from main import app
+
+# One schema for the whole run. Tests never reuse user or event ids, so the per-process
+# caches (tokens, permissions, occurrences) cannot serve another test's rows.
+Base.metadata.create_all(engine)
+
+_user_numbers = itertools.count()
+
+@dataclass
+class TestUser:
+    id: int
+    username: str
+    headers: dict
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    # Not entered as a context manager: the startup hooks start background workers
+    return TestClient(app)
+
+@pytest.fixture
+def make_user():
+    def factory() -> TestUser:
+        number = next(_user_numbers)
+        db = SessionLocal()
+        try:
+            user = User(username=f"user{number}", email=f"user{number}@example.com", hashed_password="!")
+            db.add(user)
+            db.commit()
+            token = create_access_token({"sub": str(user.id)})
+            return TestUser(id=user.id, username=user.username, headers={"Authorization": f"Bearer {token}"})
+        finally:
+            db.close()
+    return factory
+
+@pytest.fixture
+def make_event(client):
+    def factory(user: TestUser, start: datetime = datetime(2025, 1, 1, 9), minutes: int = 60, **fields) -> dict:
+        payload = {
+            "title": "event",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=minutes)).isoformat(),
+            **fields,
+        }
+        response = client.post("/api/events/", json=payload, headers=user.headers)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return factory
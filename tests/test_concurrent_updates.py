@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+from app.db.base import SessionLocal
+from app.models.changelog import Changelog
+from app.models.event import Event
+from app.models.event_version import EventVersion
+
+UPDATERS = 50
+
+def test_parallel_updates_get_contiguous_versions_and_none_are_lost(client, make_user, make_event):
+    user = make_user()
+    event_id = make_event(user, title="start")["id"]
+
+    def update(i: int) -> None:
+        response = client.put(f"/api/events/{event_id}", json={"title": f"title {i}"}, headers=user.headers)
+        assert response.status_code == 200, response.text
+
+    with ThreadPoolExecutor(UPDATERS) as pool:
+        list(pool.map(update, range(UPDATERS)))
+
+    db = SessionLocal()
+    try:
+        numbers = sorted(n for (n,) in db.query(EventVersion.version_number).filter(EventVersion.event_id == event_id))
+        assert numbers == list(range(1, UPDATERS + 2))
+        event = db.get(Event, event_id)
+        assert event.current_version == UPDATERS + 1
+
+        steps = (
+            db.query(Changelog.version_number, Changelog.changes)
+            .filter(Changelog.event_id == event_id, Changelog.version_number > 1)
+            .order_by(Changelog.version_number)
+            .all()
+        )
+        # Each version starts from the title its predecessor wrote, so no write was lost
+        titles = ["start"] + [changes["title"]["to"] for _, changes in steps]
+        assert [changes["title"]["from"] for _, changes in steps] == titles[:-1]
+        assert sorted(titles[1:]) == sorted(f"title {i}" for i in range(UPDATERS))
+        assert event.title == titles[-1]
+    finally:
+        db.close()
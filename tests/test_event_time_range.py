@@ -0,0 +1,35 @@
+from datetime import datetime
+
+def _payload(start: str, end: str) -> dict:
+    return {"title": "event", "start_time": start, "end_time": end}
+
+def test_create_rejects_end_not_after_start(client, make_user):
+    user = make_user()
+    for end in ("2025-01-01T08:00:00", "2025-01-01T09:00:00"):
+        response = client.post("/api/events/", json=_payload("2025-01-01T09:00:00", end), headers=user.headers)
+        assert response.status_code == 422, response.text
+
+def test_batch_rejects_reversed_item(client, make_user):
+    user = make_user()
+    events = [_payload("2025-01-01T09:00:00", "2025-01-01T10:00:00"), _payload("2025-01-02T09:00:00", "2025-01-02T08:00:00")]
+    response = client.post("/api/events/batch", json={"events": events}, headers=user.headers)
+    assert response.status_code == 422, response.text
+
+def test_update_rejects_reversed_range(client, make_user, make_event):
+    user = make_user()
+    event = make_event(user, start=datetime(2025, 1, 1, 9))
+    for body in (
+        {"start_time": "2025-01-01T12:00:00", "end_time": "2025-01-01T11:00:00"},
+        {"end_time": "2025-01-01T08:00:00"},
+        {"start_time": "2025-01-01T10:00:00"},
+    ):
+        response = client.put(f"/api/events/{event['id']}", json=body, headers=user.headers)
+        assert response.status_code == 422, (body, response.text)
+
+def test_offset_times_are_stored_as_naive_utc(client, make_user):
+    user = make_user()
+    response = client.post(
+        "/api/events/", json=_payload("2025-01-01T10:00:00+02:00", "2025-01-01T09:30:00Z"), headers=user.headers
+    )
+    assert response.status_code == 201, response.text
+    assert (response.json()["start_time"], response.json()["end_time"]) == ("2025-01-01T08:00:00", "2025-01-01T09:30:00")
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+import pytest
+from app.db.query_counter import count_queries
+
+def _statements(client, user, path: str) -> tuple:
+    client.get(path, headers=user.headers)  # warms the token cache for a like-for-like count
+    with count_queries() as counter:
+        response = client.get(path, headers=user.headers)
+    assert response.status_code == 200, response.text
+    return len(response.json()["items"]), counter.count
+
+@pytest.mark.parametrize("scope", ["owned", "accessible", "shared"])
+def test_listing_statement_count_does_not_grow_with_page_size(client, make_user, make_event, scope):
+    small, large, owner = make_user(), make_user(), make_user()
+    for user, count in ((small, 1), (large, 50)):
+        for i in range(count):
+            start = datetime(2025, 1, 1, 9) + timedelta(hours=i)
+            if scope == "owned":
+                make_event(user, start=start)
+                continue
+            event = make_event(owner, start=start)
+            response = client.post(
+                f"/api/events/{event['id']}/share", json={"user_id": user.id, "role": "viewer"}, headers=owner.headers
+            )
+            assert response.status_code == 200, response.text
+
+    path = f"/api/events/?scope={scope}&limit=50"
+    small_rows, small_count = _statements(client, small, path)
+    large_rows, large_count = _statements(client, large, path)
+    assert (small_rows, large_rows) == (1, 50)
+    assert small_count == large_count
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+def _daily_series(make_event, user) -> dict:
+    return make_event(user, start=datetime(2025, 1, 1, 9), is_recurring=True, recurrence_pattern="FREQ=DAILY;COUNT=10")
+
+def test_occurrences_accept_offset_window(client, make_user, make_event):
+    user = make_user()
+    series = _daily_series(make_event, user)
+    response = client.get(
+        "/api/events/occurrences",
+        params={"window_start": "2025-01-03T00:00:00Z", "window_end": "2025-01-05T02:00:00+02:00"},
+        headers=user.headers,
+    )
+    assert response.status_code == 200, response.text
+    # The window ends at midnight UTC on the 5th, so the 5th's occurrence is outside it
+    assert [o["start_time"] for o in response.json() if o["event_id"] == series["id"]] == [
+        "2025-01-03T09:00:00", "2025-01-04T09:00:00"
+    ]
+
+def test_conflicts_accept_offset_range(client, make_user, make_event):
+    user = make_user()
+    series = _daily_series(make_event, user)
+    response = client.get(
+        "/api/events/conflicts",
+        params={"start_time": "2025-01-02T09:30:00Z", "end_time": "2025-01-02T10:30:00Z"},
+        headers=user.headers,
+    )
+    assert response.status_code == 200, response.text
+    assert series["id"] in [c["id"] for c in response.json()]
+
+def test_create_warn_against_series_with_offset_times(client, make_user, make_event):
+    user = make_user()
+    series = _daily_series(make_event, user)
+    response = client.post(
+        "/api/events/?conflict_mode=warn",
+        json={"title": "clash", "start_time": "2025-01-02T09:30:00Z", "end_time": "2025-01-02T10:30:00Z"},
+        headers=user.headers,
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["conflicts"] == [series["id"]]
@@ -0,0 +1,16 @@
+def test_edits_are_attributed_to_the_acting_user(client, make_user, make_event):
+    owner, editor = make_user(), make_user()
+    event = make_event(owner)
+    response = client.post(
+        f"/api/events/{event['id']}/share", json={"user_id": editor.id, "role": "editor"}, headers=owner.headers
+    )
+    assert response.status_code == 200, response.text
+    response = client.put(f"/api/events/{event['id']}", json={"title": "renamed"}, headers=editor.headers)
+    assert response.status_code == 200, response.text
+
+    response = client.get(f"/api/events/{event['id']}/changelog", params={"created_by": editor.id}, headers=owner.headers)
+    assert response.status_code == 200, response.text
+    assert [(v["version_number"], v["created_by"]) for v in response.json()["versions"]] == [(2, editor.id)]
+
+    response = client.get(f"/api/events/{event['id']}", params={"include": "changelogs"}, headers=owner.headers)
+    assert [(c["version_number"], c["created_by"]) for c in response.json()["changelogs"]] == [(1, owner.id), (2, editor.id)]
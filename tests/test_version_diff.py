@@ -0,0 +1,22 @@
+from app.db.query_counter import count_queries
+
+def test_diff_resolves_versions_without_loading_payloads(client, make_user, make_event):
+    user = make_user()
+    event = make_event(user, title="a")
+    for title in ("b", "c"):
+        response = client.put(f"/api/events/{event['id']}", json={"title": title}, headers=user.headers)
+        assert response.status_code == 200, response.text
+    response = client.get(f"/api/events/{event['id']}/changelog", params={"include_data": "false"}, headers=user.headers)
+    first, _, last = (v["id"] for v in response.json()["versions"])
+
+    with count_queries() as counter:
+        response = client.get(f"/api/events/{event['id']}/diff/{first}/{last}", headers=user.headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["differences"] == {"title": {"from": "a", "to": "c"}}
+    assert not [s for s in counter.statements if "version_data" in s or "payload" in s]
+
+def test_diff_of_unknown_version_is_404(client, make_user, make_event):
+    user = make_user()
+    event = make_event(user)
+    response = client.get(f"/api/events/{event['id']}/diff/{10**9}/{10**9 + 1}", headers=user.headers)
+    assert response.status_code == 404, response.text